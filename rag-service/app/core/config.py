@@ -60,6 +60,7 @@ class Settings(BaseSettings):
     # Reranking configuration
     RERANKER_MODEL: RerankerModel = RerankerModel.CROSS_ENCODER_MS_MARCO_L6
     RERANKER_BATCH_SIZE: int = 16
+    RERANKER_USE_ONNX: bool = False  # Export the cross-encoder to ONNX Runtime when available
     
     # Search configuration
     MAX_SEARCH_RESULTS: int = 50
@@ -3,6 +3,9 @@ CatalystAI RAG Service - Main Application
 Handles document ingestion, embedding generation, and semantic search
 """
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
@@ -22,11 +25,23 @@ from app.models.requests import (
 )
 from app.models.responses import HealthResponse
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start loading the re-ranking model so the first search does not pay for it"""
+    warm_up_task = search_service.ranking_service.schedule_warm_up()
+    yield
+    
+    # Stop a warm-up still in progress at shutdown instead of leaving it pending
+    warm_up_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await warm_up_task
+
 # Initialize FastAPI app
 app = FastAPI(
     title="CatalystAI RAG Service",
     description="RAG and vector search service for API discovery",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -2,7 +2,8 @@
 Request models for the RAG service
 """
 
-from pydantic import BaseModel, Field
+import copy
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from typing import List, Optional, Dict, Any
 from enum import Enum
 from datetime import datetime
@@ -33,6 +34,10 @@ class APIStyle(str, Enum):
 
 class SearchFilter(BaseModel):
     """Search filters for API discovery"""
+    # Frozen so the derived filter dicts, computed once at construction, stay
+    # in sync with the fields
+    model_config = ConfigDict(frozen=True)
+    
     environments: Optional[List[Environment]] = None
     api_styles: Optional[List[APIStyle]] = None
     systems: Optional[List[str]] = None
@@ -43,6 +48,65 @@ class SearchFilter(BaseModel):
     latency_max_ms: Optional[int] = None
     availability_min: Optional[float] = None
     scope_ids: Optional[List[str]] = None
+    
+    _vector_filter_dict: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _serialized: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._vector_filter_dict = self._build_vector_filter_dict()
+        self._serialized = self._build_serialized()
+    
+    @property
+    def vector_filter_dict(self) -> Dict[str, Any]:
+        """Filters in vector database query form (a copy, safe to modify)"""
+        return copy.deepcopy(self._vector_filter_dict)
+    
+    @property
+    def serialized(self) -> Dict[str, Any]:
+        """Filters as reported back in search responses (a copy, safe to modify)"""
+        return copy.deepcopy(self._serialized)
+    
+    def _build_vector_filter_dict(self) -> Dict[str, Any]:
+        """Build the filters in vector database query form"""
+        vector_filters = {}
+        
+        if self.environments:
+            vector_filters["environment"] = {"$in": [env.value for env in self.environments]}
+        
+        if self.api_styles:
+            vector_filters["api_style"] = {"$in": [style.value for style in self.api_styles]}
+        
+        if self.systems:
+            vector_filters["system_name"] = {"$in": self.systems}
+        
+        if self.services:
+            vector_filters["service_name"] = {"$in": self.services}
+        
+        if self.tags:
+            vector_filters["tags"] = {"$in": self.tags}
+        
+        if self.pii_flagged is not None:
+            vector_filters["pii_flagged"] = self.pii_flagged
+        
+        if self.regions:
+            vector_filters["region"] = {"$in": self.regions}
+        
+        return vector_filters
+    
+    def _build_serialized(self) -> Dict[str, Any]:
+        """Build the filters as reported back in search responses"""
+        return {
+            "environments": [env.value for env in self.environments] if self.environments else None,
+            "api_styles": [style.value for style in self.api_styles] if self.api_styles else None,
+            "systems": self.systems,
+            "services": self.services,
+            "tags": self.tags,
+            "pii_flagged": self.pii_flagged,
+            "regions": self.regions,
+            "latency_max_ms": self.latency_max_ms,
+            "availability_min": self.availability_min,
+            "scope_ids": self.scope_ids
+        }
 
 class SearchRequest(BaseModel):
     """Search request for API discovery"""
@@ -2,10 +2,11 @@
 Response models for the RAG service
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+from itertools import chain
 
 class SearchResultType(str, Enum):
     ENDPOINT = "endpoint"
@@ -102,6 +103,12 @@ class SearchResults(BaseModel):
     model_used: str
     reranking_applied: bool
     citations_included: bool
+    
+    @computed_field
+    @property
+    def citations(self) -> List[Citation]:
+        """Citations of all results, collected only when read or serialized"""
+        return list(chain.from_iterable(result.citations for result in self.results if result.citations))
 
 class SearchResponse(BaseModel):
     """Search API response"""
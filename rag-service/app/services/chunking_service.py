@@ -4,7 +4,7 @@ Handles different chunking strategies for optimal retrieval
 """
 
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from loguru import logger
 
 from app.models.requests import DocumentMetadata
@@ -39,7 +39,7 @@ class ChunkingService:
         """
         
         chunk_size = chunk_size or self.default_chunk_size
-        chunk_overlap = chunk_overlap or self.default_overlap
+        chunk_overlap = self.default_overlap if chunk_overlap is None else chunk_overlap
         
         try:
             if strategy == "recursive":
@@ -76,6 +76,78 @@ class ChunkingService:
             # Fallback to simple chunking
             return self._simple_chunking(content, chunk_size)
     
+    async def create_chunks_iter(
+        self,
+        reader: Any,
+        metadata: DocumentMetadata,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        read_size: int = 64 * 1024
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream sliding window chunks from an async text reader
+        
+        Produces the same chunks as the sliding_window strategy, but only keeps
+        the unread window in memory, so chunks are yielded before the whole
+        document has been read.
+        
+        Args:
+            reader: Object with an async read(size) returning text, e.g. an aiofiles file
+            metadata: Document metadata
+            chunk_size: Size of each chunk in characters
+            chunk_overlap: Overlap between chunks
+            read_size: Characters to read per call
+            
+        Yields:
+            Chunk dictionaries with text and metadata (total_chunks is -1, unknown)
+        """
+        
+        chunk_size = chunk_size or self.default_chunk_size
+        chunk_overlap = self.default_overlap if chunk_overlap is None else chunk_overlap
+        step = chunk_size - chunk_overlap
+        if step <= 0:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        
+        buffer = ""
+        buffer_start = 0  # Offset of buffer[0] in the document
+        chunk_index = 0
+        eof = False
+        
+        while not eof or buffer:
+            if not eof:
+                data = await reader.read(read_size)
+                if data:
+                    buffer += data
+                else:
+                    eof = True
+            
+            # Emit full windows while reading; once at EOF, also the trailing partial ones
+            while buffer and (eof or len(buffer) >= chunk_size):
+                chunk_text = buffer[:chunk_size]
+                if chunk_text.strip():
+                    yield {
+                        "text": chunk_text.strip(),
+                        "start_pos": buffer_start,
+                        "end_pos": buffer_start + len(chunk_text),
+                        "metadata": {
+                            "chunk_index": chunk_index,
+                            "total_chunks": -1,  # Unknown while streaming
+                            "chunk_size": len(chunk_text.strip()),
+                            "strategy": "sliding_window",
+                            "document_type": metadata.document_type.value,
+                            "system_name": metadata.system_name,
+                            "service_name": metadata.service_name,
+                            "api_name": metadata.api_name,
+                            "tags": metadata.tags,
+                            "environment": metadata.environment.value,
+                            "owners": metadata.owners
+                        }
+                    }
+                    chunk_index += 1
+                
+                buffer = buffer[step:]
+                buffer_start += step
+    
     def _recursive_chunking(
         self,
         content: str,
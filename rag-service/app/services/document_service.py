@@ -27,7 +27,9 @@ from app.core.vector_client import VectorClient
 class DocumentService:
     """Service for processing and ingesting documents"""
     
-    def __init__(self):
+    def __init__(self, keep_content: bool = False):
+        # Whether parse results (stored with every chunk) include the raw document
+        self.keep_content = keep_content
         self.parsers = {
             DocumentType.OPENAPI: OpenAPIParser(),
             DocumentType.GRAPHQL: GraphQLParser(),
@@ -55,15 +57,17 @@ class DocumentService:
         
         try:
             # Detect document type if not specified
+            parsed = None
             if metadata.document_type == DocumentType.UNKNOWN:
-                metadata.document_type = self._detect_document_type(filename, content)
+                metadata.document_type, parsed = self._detect_document_type(filename, content)
             
             # Parse document based on type
-            parsed_data = await self._parse_document(content, metadata)
+            content_str = content.decode('utf-8')
+            parsed_data = await self._parse_document(content, metadata, content_str, parsed)
             
             # Generate chunks
             chunks = self.chunking_service.create_chunks(
-                content=parsed_data["content"],
+                content=content_str,
                 metadata=metadata,
                 chunk_size=metadata.chunk_size or 512,
                 chunk_overlap=metadata.chunk_overlap or 50
@@ -109,15 +113,23 @@ class DocumentService:
             logger.error(f"Error processing document {filename}: {str(e)}")
             raise
     
-    def _detect_document_type(self, filename: str, content: bytes) -> DocumentType:
-        """Detect document type based on filename and content"""
+    def _detect_document_type(
+        self,
+        filename: str,
+        content: bytes
+    ) -> Tuple[DocumentType, Optional[Any]]:
+        """Detect document type based on filename and content
+        
+        Also returns the JSON/YAML document loaded during detection, if any, so
+        the parser does not decode it again.
+        """
         
         # Check file extension first
         if filename.endswith('.yaml') or filename.endswith('.yml'):
             try:
                 yaml_content = yaml.safe_load(content.decode('utf-8'))
                 if 'openapi' in yaml_content or 'swagger' in yaml_content:
-                    return DocumentType.OPENAPI
+                    return DocumentType.OPENAPI, yaml_content
             except:
                 pass
         
@@ -125,51 +137,62 @@ class DocumentService:
             try:
                 json_content = json.loads(content.decode('utf-8'))
                 if 'openapi' in json_content or 'swagger' in json_content:
-                    return DocumentType.OPENAPI
+                    return DocumentType.OPENAPI, json_content
                 elif 'info' in json_content and 'schema' in json_content:
-                    return DocumentType.GRAPHQL
+                    return DocumentType.GRAPHQL, None
                 elif 'info' in json_content and 'item' in json_content:
-                    return DocumentType.POSTMAN
+                    return DocumentType.POSTMAN, json_content
             except:
                 pass
         
         elif filename.endswith('.wsdl') or filename.endswith('.xml'):
             if b'wsdl:' in content or b'<wsdl:' in content:
-                return DocumentType.WSDL
+                return DocumentType.WSDL, None
             elif b'<soap:' in content or b'<soapenv:' in content:
-                return DocumentType.SOAP
+                return DocumentType.SOAP, None
         
         elif filename.endswith('.har'):
-            return DocumentType.HAR
+            # HAR files are JSON; load them here so the parser can reuse the result
+            try:
+                return DocumentType.HAR, json.loads(content.decode('utf-8'))
+            except:
+                return DocumentType.HAR, None
         
         elif filename.endswith('.md') or filename.endswith('.markdown'):
-            return DocumentType.MARKDOWN
+            return DocumentType.MARKDOWN, None
         
         # Check content patterns
         content_str = content.decode('utf-8', errors='ignore').lower()
         
         if 'openapi' in content_str or 'swagger' in content_str:
-            return DocumentType.OPENAPI
+            return DocumentType.OPENAPI, None
         elif 'graphql' in content_str or 'type ' in content_str:
-            return DocumentType.GRAPHQL
+            return DocumentType.GRAPHQL, None
         elif 'wsdl' in content_str or 'soap' in content_str:
-            return DocumentType.SOAP
+            return DocumentType.SOAP, None
         elif 'postman' in content_str or 'collection' in content_str:
-            return DocumentType.POSTMAN
+            return DocumentType.POSTMAN, None
         elif 'http' in content_str and ('get' in content_str or 'post' in content_str):
-            return DocumentType.MARKDOWN  # Likely API documentation
+            return DocumentType.MARKDOWN, None  # Likely API documentation
         
-        return DocumentType.UNKNOWN
+        return DocumentType.UNKNOWN, None
     
-    async def _parse_document(self, content: bytes, metadata: DocumentMetadata) -> Dict[str, Any]:
-        """Parse document using appropriate parser"""
+    async def _parse_document(
+        self,
+        content: bytes,
+        metadata: DocumentMetadata,
+        content_str: Optional[str] = None,
+        parsed: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Parse document using appropriate parser, reusing an already loaded document if given"""
         
         parser = self.parsers.get(metadata.document_type)
         if not parser:
             raise ValueError(f"No parser available for document type: {metadata.document_type}")
         
-        content_str = content.decode('utf-8')
-        parsed_data = await parser.parse(content_str, metadata)
+        if content_str is None:
+            content_str = content.decode('utf-8')
+        parsed_data = await parser.parse(content_str, metadata, parsed=parsed, keep_content=self.keep_content)
         
         # Add common metadata
         parsed_data.update({
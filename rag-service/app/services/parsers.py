@@ -6,40 +6,86 @@ Each parser extracts API information using domain-specific logic and LLM prompts
 import json
 import yaml
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 from loguru import logger
 
 from app.services.parsers.base import DocumentParser
 from app.models.requests import DocumentMetadata
 
+try:
+    # RE2 is a linear-time (DFA based) engine without backtracking
+    import re2 as _linear_re
+except ImportError:
+    _linear_re = re
+
+
+def _compile_linear(pattern: str):
+    """Compile a pattern with RE2 when available, falling back to the stdlib engine
+    
+    Only for patterns that backtrack badly; RE2's per-match overhead makes it
+    slower than the stdlib engine on simple ones.
+    """
+    return _linear_re.compile(pattern)
+
+
+_HTTP_METHODS = frozenset({'get', 'post', 'put', 'delete', 'patch', 'head', 'options'})
+
+
+@lru_cache(maxsize=64)
+def _compile_operation_io(io_type: str):
+    """Compile (once per io_type) the pattern for a WSDL operation input/output/fault"""
+    return re.compile(f'<wsdl:{io_type}[^>]*>([^<]+)</wsdl:{io_type}>')
+
 class OpenAPIParser(DocumentParser):
     """Parser for OpenAPI/Swagger specifications"""
     
-    async def parse(self, content: str, metadata: DocumentMetadata) -> Dict[str, Any]:
+    # Substring checks on the lowered text beat a keyword alternation regex,
+    # since most operations contain none of these
+    _PII_KEYWORDS = (
+        'password', 'ssn', 'credit_card', 'email', 'phone', 'address',
+        'personal', 'private', 'sensitive', 'confidential'
+    )
+    
+    async def parse(
+        self,
+        content: str,
+        metadata: DocumentMetadata,
+        parsed: Optional[Any] = None,
+        keep_content: bool = False
+    ) -> Dict[str, Any]:
         """Parse OpenAPI specification"""
         try:
-            # Parse YAML/JSON content
-            if content.strip().startswith('{'):
+            # Parse YAML/JSON content unless the caller already did
+            if parsed is not None:
+                spec = parsed
+            elif content.strip().startswith('{'):
                 spec = json.loads(content)
             else:
                 spec = yaml.safe_load(content)
             
+            info = spec.get("info") or {}
+            servers = spec.get("servers")
+            
             # Extract API information
             api_info = {
-                "title": spec.get("info", {}).get("title", "Unknown API"),
-                "version": spec.get("info", {}).get("version", "1.0.0"),
-                "description": spec.get("info", {}).get("description", ""),
-                "base_url": spec.get("servers", [{}])[0].get("url", ""),
+                "title": info.get("title", "Unknown API"),
+                "version": info.get("version", "1.0.0"),
+                "description": info.get("description", ""),
+                "base_url": servers[0].get("url", "") if servers else "",
                 "api_style": "REST",
                 "endpoints": self._extract_openapi_endpoints(spec),
                 "schemas": self._extract_schemas(spec),
                 "security": self._extract_security(spec),
                 "tags": spec.get("tags", []),
-                "external_docs": spec.get("externalDocs", {}),
-                "content": content
+                "external_docs": spec.get("externalDocs", {})
             }
             
+            # The raw document is only echoed back when explicitly requested
+            if keep_content:
+                api_info["content"] = content
+            
             return api_info
             
         except Exception as e:
@@ -52,12 +98,18 @@ class OpenAPIParser(DocumentParser):
         paths = spec.get("paths", {})
         
         for path, path_item in paths.items():
+            path_safe = path.replace('/', '_')
             for method, operation in path_item.items():
-                if method.lower() in ['get', 'post', 'put', 'delete', 'patch', 'head', 'options']:
+                # The fallback operation id keeps the key as written in the spec
+                if method.lower() in _HTTP_METHODS:
+                    operation_id = operation.get("operationId")
+                    if not operation_id:
+                        operation_id = f"{method}_{path_safe}"
+                    
                     endpoint = {
                         "method": method.upper(),
                         "path": path,
-                        "operation_id": operation.get("operationId", f"{method}_{path.replace('/', '_')}"),
+                        "operation_id": operation_id,
                         "summary": operation.get("summary", ""),
                         "description": operation.get("description", ""),
                         "parameters": operation.get("parameters", []),
@@ -83,13 +135,8 @@ class OpenAPIParser(DocumentParser):
     
     def _check_pii_indicators(self, operation: Dict[str, Any]) -> bool:
         """Check if operation handles PII data"""
-        pii_keywords = [
-            'password', 'ssn', 'credit_card', 'email', 'phone', 'address',
-            'personal', 'private', 'sensitive', 'confidential'
-        ]
-        
         operation_text = json.dumps(operation).lower()
-        return any(keyword in operation_text for keyword in pii_keywords)
+        return any(keyword in operation_text for keyword in self._PII_KEYWORDS)
     
     def _extract_rate_limit(self, operation: Dict[str, Any]) -> Optional[int]:
         """Extract rate limiting information"""
@@ -102,7 +149,29 @@ class OpenAPIParser(DocumentParser):
 class GraphQLParser(DocumentParser):
     """Parser for GraphQL schemas"""
     
-    async def parse(self, content: str, metadata: DocumentMetadata) -> Dict[str, Any]:
+    _TYPE_RE = re.compile(r'type\s+(\w+)\s*\{([^}]+)\}')
+    _QUERY_RE = re.compile(r'type\s+Query\s*\{([^}]+)\}')
+    _MUTATION_RE = re.compile(r'type\s+Mutation\s*\{([^}]+)\}')
+    _SUBSCRIPTION_RE = re.compile(r'type\s+Subscription\s*\{([^}]+)\}')
+    _DIRECTIVE_RE = re.compile(r'directive\s+@(\w+)')
+    
+    # Lexer for type bodies; comments and whitespace are dropped
+    _SCANNER = re.Scanner([
+        (r'#[^\n]*', None),
+        (r'\s+', None),
+        (r'"""[\s\S]*?"""|"(?:[^"\\\n]|\\.)*"', lambda s, t: ('STRING', t, s.match.start())),
+        (r'\w+', lambda s, t: ('NAME', t, s.match.start())),
+        (r'\S', lambda s, t: (t, t, s.match.start())),
+    ])
+    _OPENERS = {'(': ')', '[': ']', '{': '}'}
+    
+    async def parse(
+        self,
+        content: str,
+        metadata: DocumentMetadata,
+        parsed: Optional[Any] = None,
+        keep_content: bool = False
+    ) -> Dict[str, Any]:
         """Parse GraphQL schema"""
         try:
             # Extract GraphQL types and operations
@@ -115,10 +184,12 @@ class GraphQLParser(DocumentParser):
                 "queries": self._extract_queries(content),
                 "mutations": self._extract_mutations(content),
                 "subscriptions": self._extract_subscriptions(content),
-                "directives": self._extract_directives(content),
-                "content": content
+                "directives": self._extract_directives(content)
             }
             
+            if keep_content:
+                api_info["content"] = content
+            
             return api_info
             
         except Exception as e:
@@ -128,9 +199,8 @@ class GraphQLParser(DocumentParser):
     def _extract_graphql_types(self, content: str) -> List[Dict[str, Any]]:
         """Extract GraphQL type definitions"""
         types = []
-        type_pattern = r'type\s+(\w+)\s*\{([^}]+)\}'
         
-        for match in re.finditer(type_pattern, content, re.MULTILINE):
+        for match in self._TYPE_RE.finditer(content):
             type_name = match.group(1)
             type_body = match.group(2)
             fields = self._extract_fields(type_body)
@@ -146,9 +216,8 @@ class GraphQLParser(DocumentParser):
     def _extract_queries(self, content: str) -> List[Dict[str, Any]]:
         """Extract GraphQL queries"""
         queries = []
-        query_pattern = r'type\s+Query\s*\{([^}]+)\}'
         
-        match = re.search(query_pattern, content, re.MULTILINE)
+        match = self._QUERY_RE.search(content)
         if match:
             query_body = match.group(1)
             queries = self._extract_fields(query_body)
@@ -158,9 +227,8 @@ class GraphQLParser(DocumentParser):
     def _extract_mutations(self, content: str) -> List[Dict[str, Any]]:
         """Extract GraphQL mutations"""
         mutations = []
-        mutation_pattern = r'type\s+Mutation\s*\{([^}]+)\}'
         
-        match = re.search(mutation_pattern, content, re.MULTILINE)
+        match = self._MUTATION_RE.search(content)
         if match:
             mutation_body = match.group(1)
             mutations = self._extract_fields(mutation_body)
@@ -170,9 +238,8 @@ class GraphQLParser(DocumentParser):
     def _extract_subscriptions(self, content: str) -> List[Dict[str, Any]]:
         """Extract GraphQL subscriptions"""
         subscriptions = []
-        subscription_pattern = r'type\s+Subscription\s*\{([^}]+)\}'
         
-        match = re.search(subscription_pattern, content, re.MULTILINE)
+        match = self._SUBSCRIPTION_RE.search(content)
         if match:
             subscription_body = match.group(1)
             subscriptions = self._extract_fields(subscription_body)
@@ -182,42 +249,96 @@ class GraphQLParser(DocumentParser):
     def _extract_fields(self, body: str) -> List[Dict[str, Any]]:
         """Extract fields from GraphQL type body"""
         fields = []
-        field_pattern = r'(\w+)\s*:\s*([^,\n]+)'
+        tokens, _ = self._SCANNER.scan(body)
+        count = len(tokens)
+        i = 0
         
-        for match in re.finditer(field_pattern, body):
-            field_name = match.group(1)
-            field_type = match.group(2).strip()
+        while i < count:
+            kind, field_name, position = tokens[i]
+            i += 1
+            
+            if kind == '@':
+                # Directive usage such as @deprecated(reason: "...")
+                i = self._skip_group(tokens, i + 1)
+                continue
+            if kind == '=':
+                # Default value of an input field
+                i = self._skip_group(tokens, i) if i < count and tokens[i][0] in self._OPENERS else i + 1
+                continue
+            if kind != 'NAME':
+                continue
+            
+            # Arguments, e.g. user(id: ID!, name: String): User
+            i = self._skip_group(tokens, i)
+            if i >= count or tokens[i][0] != ':':
+                continue
+            i += 1
+            
+            # Type reference, e.g. [String!]!
+            type_parts = []
+            has_base_type = False
+            while i < count:
+                kind, text, _ = tokens[i]
+                if kind == 'NAME':
+                    if has_base_type:
+                        break
+                    has_base_type = True
+                elif kind not in ('[', ']', '!'):
+                    break
+                type_parts.append(text)
+                i += 1
             
             fields.append({
                 "name": field_name,
-                "type": field_type,
-                "description": self._extract_field_description(body, match.start())
+                "type": ''.join(type_parts),
+                "description": self._extract_field_description(body, position)
             })
         
         return fields
     
+    def _skip_group(self, tokens: List[tuple], index: int) -> int:
+        """Skip a balanced (...), [...] or {...} group starting at index"""
+        if index >= len(tokens) or tokens[index][0] not in self._OPENERS:
+            return index
+        
+        depth = 0
+        for i in range(index, len(tokens)):
+            kind = tokens[i][0]
+            if kind in self._OPENERS:
+                depth += 1
+            elif kind in (')', ']', '}'):
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+        return len(tokens)
+    
     def _extract_directives(self, content: str) -> List[str]:
         """Extract GraphQL directives"""
-        directive_pattern = r'directive\s+@(\w+)'
-        return re.findall(directive_pattern, content)
+        return self._DIRECTIVE_RE.findall(content)
     
     def _extract_description(self, content: str, position: int) -> str:
         """Extract description for a GraphQL element"""
-        # Look for comments above the element
-        lines = content[:position].split('\n')
+        # Look for comments above the element, walking back one line at a time
         description_lines = []
+        end = position
         
-        for line in reversed(lines):
-            line = line.strip()
+        while True:
+            newline = content.rfind('\n', 0, end)
+            line = content[newline + 1:end].strip()
+            end = newline
+            
             if line.startswith('#'):
-                description_lines.insert(0, line[1:].strip())
+                description_lines.append(line[1:].strip())
             elif line.startswith('"""'):
                 # Multi-line description
-                description_lines.insert(0, line[3:].strip())
+                description_lines.append(line[3:].strip())
             elif line and not line.startswith('type'):
                 break
+            
+            if newline < 0:
+                break
         
-        return ' '.join(description_lines)
+        return ' '.join(reversed(description_lines))
     
     def _extract_field_description(self, body: str, position: int) -> str:
         """Extract description for a field"""
@@ -227,115 +348,111 @@ class GraphQLParser(DocumentParser):
 class SOAPParser(DocumentParser):
     """Parser for SOAP/WSDL specifications"""
     
-    async def parse(self, content: str, metadata: DocumentMetadata) -> Dict[str, Any]:
+    # Top-level WSDL constructs in one alternation, routed by match.lastgroup
+    _WSDL_ANY_RE = re.compile(
+        r'(?P<operation><wsdl:operation\s+name="(?P<operation_name>[^"]+)"[^>]*>)'
+        r'|(?P<message><wsdl:message\s+name="(?P<message_name>[^"]+)"[^>]*>(?P<message_body>[^<]+)</wsdl:message>)'
+        r'|(?P<type><xsd:complexType\s+name="(?P<type_name>[^"]+)"[^>]*>(?P<type_body>[^<]+)</xsd:complexType>)'
+        r'|(?P<binding><wsdl:binding\s+name="(?P<binding_name>[^"]+)"[^>]*>(?P<binding_body>[^<]+)</wsdl:binding>)'
+        r'|(?P<service><wsdl:service\s+name="(?P<service_name>[^"]+)"[^>]*>(?P<service_body>[^<]+)</wsdl:service>)'
+    )
+    _OPERATION_RE = re.compile(r'<wsdl:operation\s+name="([^"]+)"[^>]*>')
+    _PART_RE = re.compile(r'<wsdl:part\s+name="([^"]+)"\s+type="([^"]+)"[^>]*/>')
+    _ELEMENT_RE = re.compile(r'<xsd:element\s+name="([^"]+)"\s+type="([^"]+)"[^>]*/>')
+    _PROTOCOL_RE = re.compile(r'soap:binding\s+style="([^"]+)"\s+transport="([^"]+)"')
+    _PORT_RE = re.compile(r'<wsdl:port\s+name="([^"]+)"\s+binding="([^"]+)"[^>]*>([^<]+)</wsdl:port>')
+    _ADDRESS_RE = re.compile(r'<soap:address\s+location="([^"]+)"[^>]*/>')
+    _DOCUMENTATION_RE = re.compile(r'<wsdl:documentation[^>]*>([^<]+)</wsdl:documentation>')
+    
+    async def parse(
+        self,
+        content: str,
+        metadata: DocumentMetadata,
+        parsed: Optional[Any] = None,
+        keep_content: bool = False
+    ) -> Dict[str, Any]:
         """Parse SOAP/WSDL specification"""
         try:
-            # Extract SOAP operations and messages
+            # Extract SOAP operations, messages, types, bindings and services
+            wsdl = self._scan_wsdl(content)
+            
             api_info = {
                 "title": "SOAP API",
                 "version": "1.0.0",
                 "description": "SOAP Web Service",
                 "api_style": "SOAP",
-                "operations": self._extract_soap_operations(content),
-                "messages": self._extract_soap_messages(content),
-                "types": self._extract_soap_types(content),
-                "bindings": self._extract_soap_bindings(content),
-                "services": self._extract_soap_services(content),
-                "content": content
+                "operations": wsdl["operations"],
+                "messages": wsdl["messages"],
+                "types": wsdl["types"],
+                "bindings": wsdl["bindings"],
+                "services": wsdl["services"]
             }
             
+            if keep_content:
+                api_info["content"] = content
+            
             return api_info
             
         except Exception as e:
             logger.error(f"Error parsing SOAP/WSDL: {str(e)}")
             raise
     
-    def _extract_soap_operations(self, content: str) -> List[Dict[str, Any]]:
-        """Extract SOAP operations from WSDL"""
+    def _scan_wsdl(self, content: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract operations, messages, types, bindings and services in one pass"""
         operations = []
-        operation_pattern = r'<wsdl:operation\s+name="([^"]+)"[^>]*>'
-        
-        for match in re.finditer(operation_pattern, content):
-            operation_name = match.group(1)
-            operation_content = self._extract_operation_content(content, match.start())
-            
-            operations.append({
-                "name": operation_name,
-                "input": self._extract_operation_io(operation_content, "input"),
-                "output": self._extract_operation_io(operation_content, "output"),
-                "fault": self._extract_operation_io(operation_content, "fault"),
-                "description": self._extract_operation_description(operation_content)
-            })
-        
-        return operations
-    
-    def _extract_soap_messages(self, content: str) -> List[Dict[str, Any]]:
-        """Extract SOAP message definitions"""
         messages = []
-        message_pattern = r'<wsdl:message\s+name="([^"]+)"[^>]*>([^<]+)</wsdl:message>'
-        
-        for match in re.finditer(message_pattern, content):
-            message_name = match.group(1)
-            message_body = match.group(2)
-            
-            messages.append({
-                "name": message_name,
-                "parts": self._extract_message_parts(message_body),
-                "description": self._extract_message_description(message_body)
-            })
-        
-        return messages
-    
-    def _extract_soap_types(self, content: str) -> List[Dict[str, Any]]:
-        """Extract SOAP type definitions"""
         types = []
-        type_pattern = r'<xsd:complexType\s+name="([^"]+)"[^>]*>([^<]+)</xsd:complexType>'
-        
-        for match in re.finditer(type_pattern, content):
-            type_name = match.group(1)
-            type_body = match.group(2)
-            
-            types.append({
-                "name": type_name,
-                "elements": self._extract_type_elements(type_body),
-                "description": self._extract_type_description(type_body)
-            })
-        
-        return types
-    
-    def _extract_soap_bindings(self, content: str) -> List[Dict[str, Any]]:
-        """Extract SOAP bindings"""
         bindings = []
-        binding_pattern = r'<wsdl:binding\s+name="([^"]+)"[^>]*>([^<]+)</wsdl:binding>'
-        
-        for match in re.finditer(binding_pattern, content):
-            binding_name = match.group(1)
-            binding_body = match.group(2)
-            
-            bindings.append({
-                "name": binding_name,
-                "protocol": self._extract_binding_protocol(binding_body),
-                "operations": self._extract_binding_operations(binding_body)
-            })
-        
-        return bindings
-    
-    def _extract_soap_services(self, content: str) -> List[Dict[str, Any]]:
-        """Extract SOAP service definitions"""
         services = []
-        service_pattern = r'<wsdl:service\s+name="([^"]+)"[^>]*>([^<]+)</wsdl:service>'
         
-        for match in re.finditer(service_pattern, content):
-            service_name = match.group(1)
-            service_body = match.group(2)
+        for match in self._WSDL_ANY_RE.finditer(content):
+            kind = match.lastgroup
             
-            services.append({
-                "name": service_name,
-                "ports": self._extract_service_ports(service_body),
-                "description": self._extract_service_description(service_body)
-            })
+            if kind == "operation":
+                operation_content = self._extract_operation_content(content, match.start())
+                operations.append({
+                    "name": match.group("operation_name"),
+                    "input": self._extract_operation_io(operation_content, "input"),
+                    "output": self._extract_operation_io(operation_content, "output"),
+                    "fault": self._extract_operation_io(operation_content, "fault"),
+                    "description": self._extract_operation_description(operation_content)
+                })
+            elif kind == "message":
+                message_body = match.group("message_body")
+                messages.append({
+                    "name": match.group("message_name"),
+                    "parts": self._extract_message_parts(message_body),
+                    "description": self._extract_message_description(message_body)
+                })
+            elif kind == "type":
+                type_body = match.group("type_body")
+                types.append({
+                    "name": match.group("type_name"),
+                    "elements": self._extract_type_elements(type_body),
+                    "description": self._extract_type_description(type_body)
+                })
+            elif kind == "binding":
+                binding_body = match.group("binding_body")
+                bindings.append({
+                    "name": match.group("binding_name"),
+                    "protocol": self._extract_binding_protocol(binding_body),
+                    "operations": self._extract_binding_operations(binding_body)
+                })
+            elif kind == "service":
+                service_body = match.group("service_body")
+                services.append({
+                    "name": match.group("service_name"),
+                    "ports": self._extract_service_ports(service_body),
+                    "description": self._extract_service_description(service_body)
+                })
         
-        return services
+        return {
+            "operations": operations,
+            "messages": messages,
+            "types": types,
+            "bindings": bindings,
+            "services": services
+        }
     
     def _extract_operation_content(self, content: str, start_pos: int) -> str:
         """Extract content for a specific operation"""
@@ -352,16 +469,14 @@ class SOAPParser(DocumentParser):
     
     def _extract_operation_io(self, operation_content: str, io_type: str) -> Optional[str]:
         """Extract input/output/fault information"""
-        pattern = f'<wsdl:{io_type}[^>]*>([^<]+)</wsdl:{io_type}>'
-        match = re.search(pattern, operation_content)
+        match = _compile_operation_io(io_type).search(operation_content)
         return match.group(1) if match else None
     
     def _extract_message_parts(self, message_body: str) -> List[Dict[str, str]]:
         """Extract message parts"""
         parts = []
-        part_pattern = r'<wsdl:part\s+name="([^"]+)"\s+type="([^"]+)"[^>]*/>'
         
-        for match in re.finditer(part_pattern, message_body):
+        for match in self._PART_RE.finditer(message_body):
             parts.append({
                 "name": match.group(1),
                 "type": match.group(2)
@@ -372,9 +487,8 @@ class SOAPParser(DocumentParser):
     def _extract_type_elements(self, type_body: str) -> List[Dict[str, str]]:
         """Extract type elements"""
         elements = []
-        element_pattern = r'<xsd:element\s+name="([^"]+)"\s+type="([^"]+)"[^>]*/>'
         
-        for match in re.finditer(element_pattern, type_body):
+        for match in self._ELEMENT_RE.finditer(type_body):
             elements.append({
                 "name": match.group(1),
                 "type": match.group(2)
@@ -384,16 +498,14 @@ class SOAPParser(DocumentParser):
     
     def _extract_binding_protocol(self, binding_body: str) -> str:
         """Extract binding protocol"""
-        protocol_pattern = r'soap:binding\s+style="([^"]+)"\s+transport="([^"]+)"'
-        match = re.search(protocol_pattern, binding_body)
+        match = self._PROTOCOL_RE.search(binding_body)
         return f"{match.group(1)} - {match.group(2)}" if match else "Unknown"
     
     def _extract_binding_operations(self, binding_body: str) -> List[str]:
         """Extract binding operations"""
         operations = []
-        operation_pattern = r'<wsdl:operation\s+name="([^"]+)"[^>]*>'
         
-        for match in re.finditer(operation_pattern, binding_body):
+        for match in self._OPERATION_RE.finditer(binding_body):
             operations.append(match.group(1))
         
         return operations
@@ -401,15 +513,14 @@ class SOAPParser(DocumentParser):
     def _extract_service_ports(self, service_body: str) -> List[Dict[str, str]]:
         """Extract service ports"""
         ports = []
-        port_pattern = r'<wsdl:port\s+name="([^"]+)"\s+binding="([^"]+)"[^>]*>([^<]+)</wsdl:port>'
         
-        for match in re.finditer(port_pattern, service_body):
+        for match in self._PORT_RE.finditer(service_body):
             port_name = match.group(1)
             binding = match.group(2)
             port_body = match.group(3)
             
             # Extract address
-            address_match = re.search(r'<soap:address\s+location="([^"]+)"[^>]*/>', port_body)
+            address_match = self._ADDRESS_RE.search(port_body)
             address = address_match.group(1) if address_match else ""
             
             ports.append({
@@ -423,8 +534,7 @@ class SOAPParser(DocumentParser):
     def _extract_operation_description(self, operation_content: str) -> str:
         """Extract operation description"""
         # Look for documentation or comments
-        doc_pattern = r'<wsdl:documentation[^>]*>([^<]+)</wsdl:documentation>'
-        match = re.search(doc_pattern, operation_content)
+        match = self._DOCUMENTATION_RE.search(operation_content)
         return match.group(1).strip() if match else ""
     
     def _extract_message_description(self, message_body: str) -> str:
@@ -442,7 +552,27 @@ class SOAPParser(DocumentParser):
 class MarkdownParser(DocumentParser):
     """Parser for Markdown/Confluence documentation"""
     
-    async def parse(self, content: str, metadata: DocumentMetadata) -> Dict[str, Any]:
+    _TITLE_RE = re.compile(r'(?m)^#\s+(.+)$')
+    _ENDPOINT_RES = (
+        # Method + Path pattern
+        _compile_linear(r'(?im)(GET|POST|PUT|DELETE|PATCH)\s+`([^`]+)`'),
+        # Code block with HTTP method
+        re.compile(r'(?im)```(?:http|bash|curl)\s*\n(?:GET|POST|PUT|DELETE|PATCH)\s+([^\s]+)'),
+        # Table rows with endpoint information
+        _compile_linear(r'(?im)\|.*(GET|POST|PUT|DELETE|PATCH).*\|.*`([^`]+)`'),
+    )
+    _CODE_BLOCK_RE = re.compile(r'```(\w+)\s*\n([^`]+)\n```')
+    _TABLE_RE = re.compile(r'\|(.+)\|\n\|([-:\s|]+)\|\n((?:\|.+\|\n?)+)')
+    _TABLE_ROW_RE = re.compile(r'\|(.+)\|')
+    _LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+    
+    async def parse(
+        self,
+        content: str,
+        metadata: DocumentMetadata,
+        parsed: Optional[Any] = None,
+        keep_content: bool = False
+    ) -> Dict[str, Any]:
         """Parse Markdown documentation for API information"""
         try:
             # Extract API information from markdown
@@ -454,10 +584,12 @@ class MarkdownParser(DocumentParser):
                 "endpoints": self._extract_markdown_endpoints(content),
                 "code_examples": self._extract_code_examples(content),
                 "tables": self._extract_tables(content),
-                "links": self._extract_links(content),
-                "content": content
+                "links": self._extract_links(content)
             }
             
+            if keep_content:
+                api_info["content"] = content
+            
             return api_info
             
         except Exception as e:
@@ -467,21 +599,19 @@ class MarkdownParser(DocumentParser):
     def _extract_title(self, content: str) -> str:
         """Extract document title"""
         # Look for first H1 heading
-        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        title_match = self._TITLE_RE.search(content)
         return title_match.group(1).strip() if title_match else "Markdown API Documentation"
     
     def _extract_description(self, content: str) -> str:
         """Extract document description"""
         # Look for description after title
-        lines = content.split('\n')
         description_lines = []
         
-        for line in lines:
+        for line in content.splitlines():
             line = line.strip()
-            if line.startswith('#') or line.startswith('---'):
+            if not line or line.startswith(('#', '---', '```')):
                 continue
-            if line and not line.startswith('```'):
-                description_lines.append(line)
+            description_lines.append(line)
             if len(description_lines) >= 3:  # Take first few lines
                 break
         
@@ -492,17 +622,8 @@ class MarkdownParser(DocumentParser):
         endpoints = []
         
         # Look for common API documentation patterns
-        patterns = [
-            # Method + Path pattern
-            r'(GET|POST|PUT|DELETE|PATCH)\s+`([^`]+)`',
-            # Code block with HTTP method
-            r'```(?:http|bash|curl)\s*\n(?:GET|POST|PUT|DELETE|PATCH)\s+([^\s]+)',
-            # Table rows with endpoint information
-            r'\|.*(GET|POST|PUT|DELETE|PATCH).*\|.*`([^`]+)`',
-        ]
-        
-        for pattern in patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE):
+        for pattern in self._ENDPOINT_RES:
+            for match in pattern.finditer(content):
                 method = match.group(1).upper()
                 path = match.group(2) if len(match.groups()) > 1 else match.group(1)
                 
@@ -522,9 +643,8 @@ class MarkdownParser(DocumentParser):
     def _extract_code_examples(self, content: str) -> List[Dict[str, Any]]:
         """Extract code examples from markdown"""
         examples = []
-        code_block_pattern = r'```(\w+)\s*\n([^`]+)\n```'
         
-        for match in re.finditer(code_block_pattern, content, re.MULTILINE):
+        for match in self._CODE_BLOCK_RE.finditer(content):
             language = match.group(1)
             code = match.group(2)
             
@@ -539,13 +659,12 @@ class MarkdownParser(DocumentParser):
     def _extract_tables(self, content: str) -> List[Dict[str, Any]]:
         """Extract tables from markdown"""
         tables = []
-        table_pattern = r'\|(.+)\|\n\|([-:\s|]+)\|\n((?:\|.+\|\n?)+)'
         
-        for match in re.finditer(table_pattern, content, re.MULTILINE):
+        for match in self._TABLE_RE.finditer(content):
             headers = [h.strip() for h in match.group(1).split('|')]
             rows = []
             
-            for row_match in re.finditer(r'\|(.+)\|', match.group(3)):
+            for row_match in self._TABLE_ROW_RE.finditer(match.group(3)):
                 row_data = [cell.strip() for cell in row_match.group(1).split('|')]
                 if len(row_data) == len(headers):
                     rows.append(dict(zip(headers, row_data)))
@@ -561,9 +680,8 @@ class MarkdownParser(DocumentParser):
     def _extract_links(self, content: str) -> List[Dict[str, str]]:
         """Extract links from markdown"""
         links = []
-        link_pattern = r'\[([^\]]+)\]\(([^)]+)\)'
         
-        for match in re.finditer(link_pattern, content):
+        for match in self._LINK_RE.finditer(content):
             links.append({
                 "text": match.group(1),
                 "url": match.group(2)
@@ -588,23 +706,30 @@ class MarkdownParser(DocumentParser):
     
     def _extract_code_description(self, content: str, position: int) -> str:
         """Extract description for code block"""
-        # Look for text before the code block
-        before_content = content[:position]
-        lines = before_content.split('\n')
+        # Look for text before the code block, walking back one line at a time
+        end = position
         
-        for line in reversed(lines):
-            line = line.strip()
+        while end >= 0:
+            newline = content.rfind('\n', 0, end)
+            line = content[newline + 1:end].strip()
             if line and not line.startswith('```'):
                 return line
+            end = newline
         return ""
 
 class PostmanParser(DocumentParser):
     """Parser for Postman collections"""
     
-    async def parse(self, content: str, metadata: DocumentMetadata) -> Dict[str, Any]:
+    async def parse(
+        self,
+        content: str,
+        metadata: DocumentMetadata,
+        parsed: Optional[Any] = None,
+        keep_content: bool = False
+    ) -> Dict[str, Any]:
         """Parse Postman collection"""
         try:
-            collection = json.loads(content)
+            collection = parsed if parsed is not None else json.loads(content)
             
             api_info = {
                 "title": collection.get("info", {}).get("name", "Postman Collection"),
@@ -613,10 +738,12 @@ class PostmanParser(DocumentParser):
                 "api_style": "REST",
                 "endpoints": self._extract_postman_endpoints(collection),
                 "environments": collection.get("variable", []),
-                "auth": collection.get("auth", {}),
-                "content": content
+                "auth": collection.get("auth", {})
             }
             
+            if keep_content:
+                api_info["content"] = content
+            
             return api_info
             
         except Exception as e:
@@ -652,51 +779,77 @@ class PostmanParser(DocumentParser):
 class HARParser(DocumentParser):
     """Parser for HTTP Archive (HAR) files"""
     
-    async def parse(self, content: str, metadata: DocumentMetadata) -> Dict[str, Any]:
+    async def parse(
+        self,
+        content: str,
+        metadata: DocumentMetadata,
+        parsed: Optional[Any] = None,
+        keep_content: bool = False
+    ) -> Dict[str, Any]:
         """Parse HAR file"""
         try:
-            har_data = json.loads(content)
+            har_data = parsed if parsed is not None else json.loads(content)
+            endpoints, stats = self._extract_har_endpoints(har_data)
             
             api_info = {
                 "title": "HAR API Traces",
                 "version": "1.0.0",
                 "description": "API endpoints extracted from HTTP Archive",
                 "api_style": "REST",
-                "endpoints": self._extract_har_endpoints(har_data),
-                "total_requests": len(har_data.get("log", {}).get("entries", [])),
-                "time_range": self._extract_time_range(har_data),
-                "content": content
+                "endpoints": endpoints,
+                "total_requests": len(endpoints),
+                "total_response_time_ms": stats["total_response_time_ms"],
+                "total_bytes": stats["total_bytes"],
+                "time_range": self._extract_time_range(har_data)
             }
             
+            if keep_content:
+                api_info["content"] = content
+            
             return api_info
             
         except Exception as e:
             logger.error(f"Error parsing HAR file: {str(e)}")
             raise
     
-    def _extract_har_endpoints(self, har_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract endpoints from HAR data"""
+    def _extract_har_endpoints(self, har_data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+        """Extract endpoints from HAR data along with aggregate timing and size totals"""
         endpoints = []
         entries = har_data.get("log", {}).get("entries", [])
+        total_response_time = 0.0
+        total_bytes = 0
         
         for entry in entries:
             request = entry.get("request", {})
             response = entry.get("response", {})
+            response_content = response.get("content", {})
+            response_time = entry.get("time", 0)
+            content_size = response_content.get("size", 0)
+            
+            # HAR uses -1 for unknown timings and sizes; some exporters write null
+            if isinstance(response_time, (int, float)) and response_time > 0:
+                total_response_time += response_time
+            if isinstance(content_size, (int, float)) and content_size > 0:
+                total_bytes += content_size
             
             endpoint = {
                 "method": request.get("method", "GET"),
                 "path": request.get("url", ""),
                 "status_code": response.get("status", 0),
-                "response_time": entry.get("time", 0),
+                "response_time": response_time,
                 "headers": request.get("headers", []),
                 "query_string": request.get("queryString", []),
                 "post_data": request.get("postData", {}),
-                "content_type": response.get("content", {}).get("mimeType", ""),
-                "content_size": response.get("content", {}).get("size", 0)
+                "content_type": response_content.get("mimeType", ""),
+                "content_size": content_size
             }
             endpoints.append(endpoint)
         
-        return endpoints
+        stats = {
+            "total_response_time_ms": total_response_time,
+            "total_bytes": total_bytes
+        }
+        return endpoints, stats
     
     def _extract_time_range(self, har_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract time range from HAR data"""
@@ -715,10 +868,16 @@ class HARParser(DocumentParser):
     
     def _calculate_duration(self, start_time: str, end_time: str) -> float:
         """Calculate duration between two ISO timestamps"""
+        if start_time == end_time:
+            return 0.0
+
         try:
-            from datetime import datetime
-            start = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+            if start_time[-1] == 'Z':
+                start_time = start_time[:-1] + '+00:00'
+            if end_time[-1] == 'Z':
+                end_time = end_time[:-1] + '+00:00'
+            start = datetime.fromisoformat(start_time)
+            end = datetime.fromisoformat(end_time)
             return (end - start).total_seconds()
         except:
             return 0.0
@@ -3,23 +3,122 @@ Ranking service for re-ranking search results
 Uses cross-encoder models for improved relevance scoring
 """
 
+import asyncio
+import functools
+import heapq
+import importlib.util
+import inspect
+import itertools
+import operator
+import os
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
+import numpy as np
 from loguru import logger
 
+from app.core.config import settings
+
+# C-implemented sort key for re-ranked result dicts
+_RERANK_KEY = operator.itemgetter("rerank_score")
+
+# sentence_transformers.CrossEncoder, resolved on first use (or at startup warm-up)
+_CROSS_ENCODER_CLS = None
+
+def _import_cross_encoder():
+    """Import sentence_transformers once and cache the CrossEncoder class"""
+    global _CROSS_ENCODER_CLS
+    if _CROSS_ENCODER_CLS is None:
+        from sentence_transformers import CrossEncoder
+        _CROSS_ENCODER_CLS = CrossEncoder
+    return _CROSS_ENCODER_CLS
+
+class _InferenceModeCrossEncoder:
+    """Wraps a CrossEncoder so predict runs under torch.inference_mode()"""
+    
+    def __init__(self, model, torch_module):
+        self._model = model
+        self._torch = torch_module
+    
+    def predict(self, *args, **kwargs):
+        with self._torch.inference_mode():
+            return self._model.predict(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+class _OnnxCrossEncoder:
+    """Scores query-document pairs with an ONNX Runtime session exported from a CrossEncoder"""
+    
+    def __init__(self, model, session, torch_module):
+        self._model = model
+        self._session = session
+        self._torch = torch_module
+        self._input_names = [session_input.name for session_input in session.get_inputs()]
+    
+    def predict(self, sentences, batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        batch_logits = []
+        
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            features = self._model.tokenizer(
+                [pair[0] for pair in batch],
+                [pair[1] for pair in batch],
+                padding=True,
+                truncation="longest_first",
+                max_length=self._model.max_length,
+                return_tensors="np"
+            )
+            inputs = {name: features[name].astype(np.int64) for name in self._input_names}
+            batch_logits.append(self._session.run(None, inputs)[0])
+        
+        # Same activation and output shape as CrossEncoder.predict
+        logits = self._torch.from_numpy(np.concatenate(batch_logits).astype(np.float32))
+        scores = self._model.default_activation_function(logits).numpy()
+        if self._model.config.num_labels == 1:
+            scores = scores[:, 0]
+        return scores
+    
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
 class RankingService:
     """Service for re-ranking search results using cross-encoder models"""
     
     def __init__(self):
         self.models = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._predict_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cross-encoder")
         self.default_model = "cross-encoder-ms-marco-MiniLM-L-6-v2"
+        self.batch_size = 64
+        self.max_text_chars = 4096  # ~8 characters per token for a 512 token model
+        self._warm_up_task: Optional[asyncio.Task] = None
+    
+    def schedule_warm_up(self) -> asyncio.Task:
+        """Import sentence_transformers and load the default model in the background"""
+        if self._warm_up_task is None:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self._warm_up())
+        return self._warm_up_task
+    
+    async def _warm_up(self):
+        """Pay the import and default model load before the first request does"""
+        if importlib.util.find_spec("sentence_transformers") is None:
+            return
+        
+        try:
+            await asyncio.to_thread(_import_cross_encoder)
+            await self._get_model(self.default_model)
+        except Exception as e:
+            logger.warning(f"Cross-encoder warm-up failed, loading on first request instead: {str(e)}")
     
     async def rerank_results(
         self,
         query: str,
         results: List[Dict[str, Any]],
         model: Optional[str] = None,
-        batch_size: Optional[int] = None
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Re-rank search results using cross-encoder model
@@ -29,6 +128,7 @@ class RankingService:
             results: List of search results to re-rank
             model: Cross-encoder model to use
             batch_size: Batch size for processing
+            limit: Only return the top N re-ranked results (all when None)
             
         Returns:
             Re-ranked list of results
@@ -51,26 +151,38 @@ class RankingService:
                 result_text = self._create_result_text(result)
                 query_result_pairs.append((query, result_text))
             
-            # Score pairs in batches
-            if batch_size and len(query_result_pairs) > batch_size:
-                scores = []
-                for i in range(0, len(query_result_pairs), batch_size):
-                    batch = query_result_pairs[i:i + batch_size]
-                    batch_scores = cross_encoder.predict(batch)
-                    scores.extend(batch_scores)
-            else:
-                scores = cross_encoder.predict(query_result_pairs)
+            # Score pairs in buckets of similar length so each batch pads to a
+            # similar sequence length, then scatter scores back to result order
+            bucket_size = batch_size or self.batch_size
+            lengths = np.fromiter(
+                (len(q) + len(text) for q, text in query_result_pairs),
+                dtype=np.int64,
+                count=len(query_result_pairs)
+            )
+            order = np.argsort(lengths, kind="stable")
+            scores = np.empty(len(query_result_pairs), dtype=np.float64)
+            
+            for i in range(0, len(order), bucket_size):
+                bucket = order[i:i + bucket_size]
+                scores[bucket] = await self._predict(
+                    cross_encoder,
+                    [query_result_pairs[j] for j in bucket],
+                    batch_size=bucket_size
+                )
             
-            # Update results with new scores
-            for i, result in enumerate(results):
-                result["rerank_score"] = float(scores[i])
+            # Update results with new scores (one tolist() instead of a float() per element)
+            for i, (result, score) in enumerate(zip(results, scores.tolist())):
+                result["rerank_score"] = score
                 result["original_rank"] = i
             
-            # Sort by re-rank score
-            reranked_results = sorted(results, key=lambda x: x["rerank_score"], reverse=True)
+            # Select the top results by re-rank score; O(N log K) when a limit is given
+            reranked_results = heapq.nlargest(limit or len(results), results, key=_RERANK_KEY)
             
             processing_time = (time.time() - start_time) * 1000
-            logger.info(f"Re-ranked {len(results)} results using {model_name} in {processing_time:.2f}ms")
+            logger.opt(lazy=True).info(
+                "Re-ranked {} results using {} in {:.2f}ms",
+                lambda: len(results), lambda: model_name, lambda: processing_time
+            )
             
             return reranked_results
             
@@ -79,8 +191,28 @@ class RankingService:
             # Return original results if re-ranking fails
             return results
     
-    def _create_result_text(self, result: Dict[str, Any]) -> str:
-        """Create text representation of result for cross-encoder scoring"""
+    async def _predict(self, cross_encoder, pairs: List[tuple], batch_size: int):
+        """Score pairs on the inference thread so the event loop is not blocked
+        
+        A single worker keeps model calls serialized, which CUDA prefers.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._predict_executor,
+            functools.partial(cross_encoder.predict, pairs, batch_size=batch_size, show_progress_bar=False)
+        )
+    
+    def _create_result_text(self, result: Dict[str, Any], memo: Optional[Dict[int, str]] = None) -> str:
+        """Create text representation of result for cross-encoder scoring
+        
+        When a memo is given (keyed by id(result), valid for a single call),
+        a result that appears more than once is only rendered once.
+        """
+        
+        if memo is not None:
+            cached_text = memo.get(id(result))
+            if cached_text is not None:
+                return cached_text
         
         text_parts = []
         
@@ -117,38 +249,127 @@ class RankingService:
         # Join all parts
         result_text = " | ".join(text_parts)
         
-        # Truncate if too long (cross-encoders have input length limits)
-        max_length = 512
-        if len(result_text) > max_length:
-            result_text = result_text[:max_length] + "..."
+        # The tokenizer truncates each pair to the model's max sequence length
+        # (trimming the result text, not the query). Only cap pathological text
+        # here so it is not tokenized in full just to be thrown away.
+        if len(result_text) > self.max_text_chars:
+            result_text = result_text[:self.max_text_chars]
         
+        if memo is not None:
+            memo[id(result)] = result_text
         return result_text
     
     async def _get_model(self, model_name: str):
         """Get or load a cross-encoder model"""
         
-        if model_name not in self.models:
-            try:
-                logger.info(f"Loading cross-encoder model: {model_name}")
-                
-                # Import here to avoid loading models at startup
-                from sentence_transformers import CrossEncoder
-                
-                model = CrossEncoder(model_name)
-                self.models[model_name] = model
-                logger.info(f"Successfully loaded cross-encoder model: {model_name}")
-                
-            except Exception as e:
-                logger.error(f"Error loading cross-encoder model {model_name}: {str(e)}")
-                # Fallback to default model
-                if model_name != self.default_model:
-                    logger.info(f"Falling back to default cross-encoder model: {self.default_model}")
-                    return await self._get_model(self.default_model)
-                else:
-                    raise
+        if model_name in self.models:
+            return self.models[model_name]
+        
+        # One lock per model so concurrent first requests wait for a single load
+        lock = self._load_locks.setdefault(model_name, asyncio.Lock())
+        
+        async with lock:
+            if model_name not in self.models:
+                try:
+                    logger.info(f"Loading cross-encoder model: {model_name}")
+                    
+                    # Load off the event loop; this imports torch and reads weights from disk
+                    self.models[model_name] = await asyncio.to_thread(self._load_model, model_name)
+                    logger.info(f"Successfully loaded cross-encoder model: {model_name}")
+                    
+                except Exception as e:
+                    logger.error(f"Error loading cross-encoder model {model_name}: {str(e)}")
+                    # Fallback to default model
+                    if model_name != self.default_model:
+                        logger.info(f"Falling back to default cross-encoder model: {self.default_model}")
+                        return await self._get_model(self.default_model)
+                    else:
+                        raise
         
         return self.models[model_name]
     
+    def _load_model(self, model_name: str):
+        """Load a cross-encoder model and prepare it for inference"""
+        
+        # Import here to avoid loading torch at module import
+        import torch
+        CrossEncoder = _import_cross_encoder()
+        
+        model = CrossEncoder(model_name)
+        onnx_model = self._load_onnx_model(model, model_name, torch) if settings.RERANKER_USE_ONNX else None
+        if onnx_model is not None:
+            return onnx_model
+        
+        if torch.cuda.is_available():
+            # Half precision lets the forward pass use tensor cores;
+            # rerank scores are practically unchanged
+            model.model.half()
+            torch.set_float32_matmul_precision('high')
+        
+        return _InferenceModeCrossEncoder(model, torch)
+    
+    def _load_onnx_model(self, model, model_name: str, torch_module):
+        """Export a loaded CrossEncoder to ONNX (once) and wrap it in an ONNX Runtime session
+        
+        Returns None when onnxruntime is not installed, when only CPU execution is
+        available on a CUDA host (the half precision PyTorch path is faster there),
+        or when the export fails, in which case the PyTorch model is used.
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            return None
+        
+        available_providers = ort.get_available_providers()
+        if torch_module.cuda.is_available() and "CUDAExecutionProvider" not in available_providers:
+            return None
+        
+        try:
+            onnx_dir = os.path.join(settings.MODEL_CACHE_DIR, "onnx")
+            onnx_path = os.path.join(onnx_dir, model_name.replace("/", "__") + ".onnx")
+            
+            if not os.path.exists(onnx_path):
+                os.makedirs(onnx_dir, exist_ok=True)
+                
+                dummy_inputs = model.tokenizer(["query"], ["document"], return_tensors="pt").to(model.model.device)
+                forward_params = inspect.signature(model.model.forward).parameters
+                input_names = [name for name in forward_params if name in dummy_inputs]
+                dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+                dynamic_axes["logits"] = {0: "batch"}
+                
+                # Export to a temporary file and rename it into place, so an
+                # interrupted or concurrent export never leaves a truncated model
+                fd, tmp_path = tempfile.mkstemp(dir=onnx_dir, suffix=".onnx.tmp")
+                os.close(fd)
+                try:
+                    model.model.eval()
+                    with torch_module.no_grad():
+                        torch_module.onnx.export(
+                            model.model,
+                            ({name: dummy_inputs[name] for name in input_names},),
+                            tmp_path,
+                            input_names=input_names,
+                            output_names=["logits"],
+                            dynamic_axes=dynamic_axes,
+                            opset_version=17
+                        )
+                    os.replace(tmp_path, onnx_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                logger.info(f"Exported cross-encoder model {model_name} to ONNX: {onnx_path}")
+            
+            providers = [
+                provider for provider in ("CUDAExecutionProvider", "CPUExecutionProvider")
+                if provider in available_providers
+            ]
+            session = ort.InferenceSession(onnx_path, providers=providers)
+            return _OnnxCrossEncoder(model, session, torch_module)
+            
+        except Exception as e:
+            logger.warning(f"ONNX export failed for cross-encoder model {model_name}, using PyTorch: {str(e)}")
+            return None
+    
     def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """Get information about a specific cross-encoder model"""
         try:
@@ -209,13 +430,50 @@ class RankingService:
         if len(queries) != len(results_list):
             raise ValueError("Number of queries must match number of result lists")
         
-        reranked_results = []
+        model_name = model or self.default_model
+        start_time = time.time()
+        
+        # Build the query-result pairs of every query up front; result sets of
+        # different queries often share results, so their text is built once
+        text_memo: Dict[int, str] = {}
+        pairs_per_query = [
+            [(query, self._create_result_text(result, text_memo)) for result in results]
+            for query, results in zip(queries, results_list)
+        ]
+        flat_pairs = list(itertools.chain.from_iterable(pairs_per_query))
         
-        for query, results in zip(queries, results_list):
-            reranked = await self.rerank_results(query, results, model)
-            reranked_results.append(reranked)
+        if not flat_pairs:
+            return [[] for _ in results_list]
         
-        return reranked_results
+        try:
+            cross_encoder = await self._get_model(model_name)
+            
+            # Score all pairs in a single predict call so batches span queries
+            scores = await self._predict(cross_encoder, flat_pairs, batch_size=self.batch_size)
+            
+            # Split scores back per query and sort each result set
+            flat_scores = np.asarray(scores, dtype=np.float64).tolist()
+            reranked_results = []
+            offset = 0
+            for results in results_list:
+                for i, result in enumerate(results):
+                    result["rerank_score"] = flat_scores[offset + i]
+                    result["original_rank"] = i
+                offset += len(results)
+                reranked_results.append(sorted(results, key=_RERANK_KEY, reverse=True))
+            
+            processing_time = (time.time() - start_time) * 1000
+            logger.opt(lazy=True).info(
+                "Batch re-ranked {} results for {} queries using {} in {:.2f}ms",
+                lambda: len(flat_pairs), lambda: len(queries), lambda: model_name, lambda: processing_time
+            )
+            
+            return reranked_results
+            
+        except Exception as e:
+            logger.error(f"Error during batch re-ranking: {str(e)}")
+            # Return original results if re-ranking fails
+            return results_list
     
     def calculate_ranking_metrics(
         self,
@@ -3,23 +3,154 @@ Search service for API discovery with SOLAR-style ranking
 Implements hybrid search combining vector similarity, keyword search, and re-ranking
 """
 
+import asyncio
+import functools
 import time
-from typing import List, Dict, Any, Optional, AsyncGenerator
-from datetime import datetime
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, AsyncGenerator, Sequence, Set, Tuple, Union
+from datetime import datetime, timezone
+import numpy as np
 from loguru import logger
 
 from app.models.requests import SearchRequest, SearchFilter
-from app.models.responses import SearchResult, SearchResults, Citation
+from app.models.responses import SearchResult, SearchResults
 from app.core.vector_client import VectorClient
 from app.services.embedding_service import EmbeddingService
 from app.services.ranking_service import RankingService
 
+
+@dataclass
+class CandidateBatch:
+    """Merged search candidates stored column-wise, with the raw dicts kept for result reconstruction"""
+    raw: List[Dict[str, Any]]
+    ids: np.ndarray
+    vector_score: np.ndarray
+    keyword_score: np.ndarray
+    latency: np.ndarray
+    availability: np.ndarray
+    region: np.ndarray
+    last_updated: np.ndarray
+    scopes: List[frozenset]
+    
+    @classmethod
+    def from_results(cls, results: List[Dict[str, Any]]) -> "CandidateBatch":
+        """Build the column arrays from a list of merged result dicts"""
+        count = len(results)
+        return cls(
+            raw=results,
+            ids=np.array([result.get("id") for result in results], dtype=object),
+            vector_score=np.fromiter((result.get("vector_score", 0.0) for result in results), dtype=float, count=count),
+            keyword_score=np.fromiter((result.get("keyword_score", 0.0) for result in results), dtype=float, count=count),
+            # Missing latency/availability become NaN
+            latency=np.array([result.get("latency_ms_p50") for result in results], dtype=float),
+            availability=np.array([result.get("availability_slo") for result in results], dtype=float),
+            region=np.array([result.get("region") for result in results], dtype=object),
+            last_updated=np.array([result.get("last_updated") for result in results], dtype=object),
+            scopes=[frozenset(result.get("scopes") or ()) for result in results]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.raw)
+    
+    def select(self, index: Union[slice, Sequence[int], np.ndarray]) -> "CandidateBatch":
+        """Return the candidates at the given slice or positions, in that order"""
+        if isinstance(index, slice):
+            raw = self.raw[index]
+            scopes = self.scopes[index]
+        else:
+            index = np.asarray(index, dtype=np.intp)
+            raw = [self.raw[i] for i in index]
+            scopes = [self.scopes[i] for i in index]
+        
+        return CandidateBatch(
+            raw=raw,
+            ids=self.ids[index],
+            vector_score=self.vector_score[index],
+            keyword_score=self.keyword_score[index],
+            latency=self.latency[index],
+            availability=self.availability[index],
+            region=self.region[index],
+            last_updated=self.last_updated[index],
+            scopes=scopes
+        )
+
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent single-query embedding requests into one generate_embeddings call per model"""
+    
+    def __init__(self, embedding_service: EmbeddingService, window_seconds: float = 0.005):
+        self.embedding_service = embedding_service
+        self.window_seconds = window_seconds
+        # Pending (model, [(text, future)]) batches keyed by id(model); the model is held so the id stays valid
+        self._pending: Dict[int, Tuple[Any, List[Tuple[str, asyncio.Future]]]] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+    
+    async def embed(self, text: str, model: Any) -> Any:
+        """Embed a single text, sharing a batch with other requests made within the window"""
+        loop = asyncio.get_running_loop()
+        key = id(model)
+        
+        batch = self._pending.get(key)
+        if batch is None:
+            # First request for this model opens the window and schedules the flush
+            batch = self._pending[key] = (model, [])
+            task = loop.create_task(self._flush(key, batch))
+            self._flush_tasks.add(task)
+            task.add_done_callback(functools.partial(self._flush_done, key, batch))
+        
+        future = loop.create_future()
+        batch[1].append((text, future))
+        return await future
+    
+    async def _flush(self, key: int, batch: Tuple[Any, List[Tuple[str, asyncio.Future]]]):
+        """Wait out the window, then embed everything queued for the model in one call"""
+        await asyncio.sleep(self.window_seconds)
+        # Close the window; requests from here on open a new batch
+        del self._pending[key]
+        model, requests = batch
+        
+        try:
+            embeddings = await self.embedding_service.generate_embeddings(
+                texts=[text for text, _ in requests],
+                model=model
+            )
+            if len(embeddings) != len(requests):
+                raise RuntimeError(f"Expected {len(requests)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), embedding in zip(requests, embeddings):
+            # Callers that were cancelled while waiting are skipped
+            if not future.done():
+                future.set_result(embedding)
+    
+    def _flush_done(self, key: int, batch: Tuple[Any, List[Tuple[str, asyncio.Future]]], task: asyncio.Task):
+        """Fail whatever a cancelled or crashed flush left unresolved, so no caller waits forever"""
+        self._flush_tasks.discard(task)
+        
+        # A flush cancelled during (or before) its window must not leave the batch open
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        
+        for _, future in batch[1]:
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batch was cancelled before it completed"))
+
+
 class SearchService:
     """Service for API discovery search with intelligent ranking"""
     
+    # Weights for relevance, performance, geographic, freshness, permission,
+    # historical and popularity signals, in that order
+    _SOLAR_WEIGHTS = np.array([0.4, 0.15, 0.1, 0.1, 0.15, 0.05, 0.05])
+    
     def __init__(self):
         self.ranking_service = RankingService()
         self.embedding_service = EmbeddingService()
+        self._embed_batcher = _EmbeddingBatcher(self.embedding_service)
     
     async def hybrid_search(
         self,
@@ -40,44 +171,40 @@ class SearchService:
         start_time = time.time()
         
         try:
-            # Step 1: Generate query embedding
-            query_embedding = await self.embedding_service.generate_embeddings(
-                texts=[query],
-                model=embedding_model
+            # Steps 1-3: Embed the query and run vector similarity search, while the
+            # keyword search (which needs no embedding) runs concurrently
+            vector_results, keyword_results = await asyncio.gather(
+                self._vector_search(query, filters, vector_client, embedding_model, limit=50),
+                self._keyword_search(query, filters, limit=50)
             )
             
-            # Step 2: Vector similarity search
-            vector_results = await vector_client.similarity_search(
-                query_embedding[0],
-                limit=50,  # Get more results for re-ranking
-                filters=self._build_vector_filters(filters)
-            )
-            
-            # Step 3: Keyword search (if available)
-            keyword_results = await self._keyword_search(query, filters, limit=50)
-            
             # Step 4: Merge and deduplicate results
-            merged_results = self._merge_search_results(vector_results, keyword_results)
+            candidates = self._merge_search_results(vector_results, keyword_results)
             
             # Step 5: Re-ranking with cross-encoder
-            if len(merged_results) > 10:
+            reranking_applied = len(candidates) > 10
+            if reranking_applied:
+                # Only the top `limit` results survive scoring, so only those are kept
+                rerank_candidates = candidates.raw[:20]  # Limit for re-ranking
                 reranked_results = await self.ranking_service.rerank_results(
                     query=query,
-                    results=merged_results[:20],  # Limit for re-ranking
-                    model="cross-encoder-ms-marco-MiniLM-L-6-v2"
+                    results=rerank_candidates,
+                    model="cross-encoder-ms-marco-MiniLM-L-6-v2",
+                    limit=limit
                 )
-                merged_results = reranked_results + merged_results[20:]
+                
+                # The re-ranker returns the same dicts, so map them back to their rows
+                positions = {id(result): i for i, result in enumerate(rerank_candidates)}
+                order = [positions[id(result)] for result in reranked_results]
+                candidates = candidates.select(order + list(range(len(rerank_candidates), len(candidates))))
             
             # Step 6: Apply SOLAR-style scoring
             scored_results = await self._apply_solar_scoring(
                 query=query,
-                results=merged_results[:limit],
+                candidates=candidates.select(slice(None, limit)),
                 filters=filters
             )
             
-            # Step 7: Generate citations
-            citations = self._generate_citations(scored_results)
-            
             search_time = (time.time() - start_time) * 1000
             
             return SearchResults(
@@ -87,7 +214,7 @@ class SearchService:
                 query=query,
                 filters_applied=self._serialize_filters(filters),
                 model_used=str(embedding_model),
-                reranking_applied=len(merged_results) > 10,
+                reranking_applied=reranking_applied,
                 citations_included=True
             )
             
@@ -122,6 +249,24 @@ class SearchService:
         except Exception as e:
             logger.error(f"Error during stream search: {str(e)}")
     
+    async def _vector_search(
+        self,
+        query: str,
+        filters: Optional[SearchFilter],
+        vector_client: VectorClient,
+        embedding_model: Any,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Generate the query embedding and run vector similarity search"""
+        # Batched with other in-flight queries for the same model
+        query_embedding = await self._embed_batcher.embed(query, embedding_model)
+        
+        return await vector_client.similarity_search(
+            query_embedding,
+            limit=limit,  # Get more results for re-ranking
+            filters=self._build_vector_filters(filters)
+        )
+    
     async def _keyword_search(
         self,
         query: str,
@@ -137,7 +282,7 @@ class SearchService:
         self,
         vector_results: List[Dict[str, Any]],
         keyword_results: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> CandidateBatch:
         """Merge and deduplicate search results"""
         
         merged = {}
@@ -164,42 +309,55 @@ class SearchService:
                     "keyword_score": result.get("score", 0.0)
                 }
         
-        # Convert to list and sort by combined score
-        merged_list = list(merged.values())
-        merged_list.sort(key=lambda x: x.get("vector_score", 0) + x.get("keyword_score", 0), reverse=True)
+        # Convert to columns and order by combined score (stable, so ties keep insertion order)
+        candidates = CandidateBatch.from_results(list(merged.values()))
+        order = np.argsort(-(candidates.vector_score + candidates.keyword_score), kind="stable")
         
-        return merged_list
+        return candidates.select(order)
     
     async def _apply_solar_scoring(
         self,
         query: str,
-        results: List[Dict[str, Any]],
+        candidates: CandidateBatch,
         filters: Optional[SearchFilter] = None
     ) -> List[SearchResult]:
         """Apply SOLAR-style scoring to search results"""
         
+        if not len(candidates):
+            return []
+        
+        # Filter lists are hashed once per query rather than once per result
+        region_set = frozenset(filters.regions) if filters and filters.regions else None
+        scope_set = frozenset(filters.scope_ids) if filters and filters.scope_ids else None
+        
+        # One row per result, one column per signal (see _SOLAR_WEIGHTS); NaN marks a missing signal
+        signals = np.column_stack([
+            candidates.vector_score,
+            self._calculate_performance_scores(candidates.latency, candidates.availability),
+            np.array([self._calculate_geographic_score(region, region_set) for region in candidates.region], dtype=float),
+            self._calculate_freshness_scores(candidates.last_updated),
+            np.array([self._calculate_permission_score(scopes, scope_set) for scopes in candidates.scopes], dtype=float),
+            np.array([self._calculate_historical_score(result) for result in candidates.raw], dtype=float),
+            np.array([self._calculate_popularity_score(result) for result in candidates.raw], dtype=float)
+        ])
+        
+        # Weighted sum over the present signals, capped at 1.0
+        final_scores = np.minimum(np.nan_to_num(signals, nan=0.0) @ self._SOLAR_WEIGHTS, 1.0)
+        
+        # Materialize results in final score order (stable, so ties keep their rank)
         scored_results = []
         
-        for result in results:
-            # Calculate individual scores
-            relevance_score = result.get("vector_score", 0.0)
-            performance_score = self._calculate_performance_score(result)
-            geographic_score = self._calculate_geographic_score(result, filters)
-            freshness_score = self._calculate_freshness_score(result)
-            permission_score = self._calculate_permission_score(result, filters)
-            historical_score = self._calculate_historical_score(result)
-            popularity_score = self._calculate_popularity_score(result)
-            
-            # Calculate final weighted score
-            final_score = self._calculate_final_score(
-                relevance_score=relevance_score,
-                performance_score=performance_score,
-                geographic_score=geographic_score,
-                freshness_score=freshness_score,
-                permission_score=permission_score,
-                historical_score=historical_score,
-                popularity_score=popularity_score
-            )
+        for i in np.argsort(-final_scores, kind="stable"):
+            result = candidates.raw[i]
+            (
+                _,
+                performance_score,
+                geographic_score,
+                freshness_score,
+                permission_score,
+                historical_score,
+                popularity_score
+            ) = map(self._to_optional_score, signals[i])
             
             # Create SearchResult object
             search_result = SearchResult(
@@ -207,8 +365,8 @@ class SearchService:
                 result_type=result.get("type", "endpoint"),
                 title=result.get("title", ""),
                 content=result.get("content", ""),
-                score=final_score,
-                relevance_score=relevance_score,
+                score=float(final_scores[i]),
+                relevance_score=float(candidates.vector_score[i]),
                 performance_score=performance_score,
                 geographic_score=geographic_score,
                 freshness_score=freshness_score,
@@ -226,106 +384,101 @@ class SearchService:
             
             scored_results.append(search_result)
         
-        # Sort by final score
-        scored_results.sort(key=lambda x: x.score, reverse=True)
-        
         return scored_results
     
-    def _calculate_performance_score(self, result: Dict[str, Any]) -> Optional[float]:
-        """Calculate performance score based on latency and availability"""
-        latency = result.get("latency_ms_p50")
-        availability = result.get("availability_slo")
-        
-        if latency is None and availability is None:
-            return None
-        
-        score = 0.0
+    def _calculate_performance_scores(self, latency: np.ndarray, availability: np.ndarray) -> np.ndarray:
+        """Calculate performance scores based on latency and availability for all results"""
+        latency_missing = np.isnan(latency)
+        availability_missing = np.isnan(availability)
         
         # Latency scoring (lower is better)
-        if latency is not None:
-            if latency < 100:
-                score += 0.4
-            elif latency < 500:
-                score += 0.3
-            elif latency < 1000:
-                score += 0.2
-            else:
-                score += 0.1
+        latency_score = np.select(
+            [latency < 100, latency < 500, latency < 1000],
+            [0.4, 0.3, 0.2],
+            default=0.1
+        )
+        latency_score[latency_missing] = 0.0
         
         # Availability scoring (higher is better)
-        if availability is not None:
-            if availability >= 0.999:
-                score += 0.6
-            elif availability >= 0.99:
-                score += 0.4
-            elif availability >= 0.95:
-                score += 0.2
-            else:
-                score += 0.1
-        
-        return min(score, 1.0)
+        availability_score = np.select(
+            [availability >= 0.999, availability >= 0.99, availability >= 0.95],
+            [0.6, 0.4, 0.2],
+            default=0.1
+        )
+        availability_score[availability_missing] = 0.0
+        
+        scores = np.minimum(latency_score + availability_score, 1.0)
+        scores[latency_missing & availability_missing] = np.nan
+        return scores
     
-    def _calculate_geographic_score(self, result: Dict[str, Any], filters: Optional[SearchFilter]) -> Optional[float]:
-        """Calculate geographic proximity score"""
-        if not filters or not filters.regions:
+    def _calculate_geographic_score(self, result_region: Optional[str], region_set: Optional[frozenset]) -> Optional[float]:
+        """Calculate geographic proximity score against the requested regions"""
+        if not region_set:
             return None
         
-        result_region = result.get("region")
         if not result_region:
             return None
         
         # Simple region matching (could be enhanced with actual geographic distance)
-        if result_region in filters.regions:
+        if result_region in region_set:
             return 1.0
-        elif any(region in result_region for region in filters.regions):
+        elif any(region in result_region for region in region_set):
             return 0.7
         else:
             return 0.3
     
-    def _calculate_freshness_score(self, result: Dict[str, Any]) -> Optional[float]:
-        """Calculate freshness score based on last update"""
-        last_updated = result.get("last_updated")
+    def _calculate_freshness_scores(self, last_updated: np.ndarray) -> np.ndarray:
+        """Calculate freshness scores based on last update for all results"""
+        # Take "now" once for the whole batch, both naive (local) and UTC aware
+        now = datetime.now()
+        now_utc = datetime.now(timezone.utc)
+        
+        days_old = np.array(
+            [self._days_since_update(value, now, now_utc) for value in last_updated],
+            dtype=float
+        )
+        
+        scores = np.select(
+            [days_old < 30, days_old < 90, days_old < 180, days_old < 365],
+            [1.0, 0.8, 0.6, 0.4],
+            default=0.2
+        )
+        scores[np.isnan(days_old)] = np.nan
+        return scores
+    
+    def _days_since_update(self, last_updated: Any, now: datetime, now_utc: datetime) -> Optional[int]:
+        """Days since a result was last updated, or None if unknown"""
         if not last_updated:
             return None
         
         try:
             if isinstance(last_updated, str):
-                from datetime import datetime
-                last_updated = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+                if last_updated[-1] == 'Z':
+                    last_updated = last_updated[:-1] + '+00:00'
+                last_updated = datetime.fromisoformat(last_updated)
             
-            days_old = (datetime.now() - last_updated).days
-            
-            if days_old < 30:
-                return 1.0
-            elif days_old < 90:
-                return 0.8
-            elif days_old < 180:
-                return 0.6
-            elif days_old < 365:
-                return 0.4
-            else:
-                return 0.2
-                
-        except:
+            # Naive timestamps are local time; offset-aware ones compare against UTC now
+            reference = now if last_updated.tzinfo is None else now_utc
+            return (reference - last_updated).days
+        except Exception:
             return None
     
-    def _calculate_permission_score(self, result: Dict[str, Any], filters: Optional[SearchFilter]) -> Optional[float]:
-        """Calculate permission fit score"""
-        if not filters or not filters.scope_ids:
+    def _to_optional_score(self, score: float) -> Optional[float]:
+        """Convert a vectorized score back to a float, mapping NaN to None"""
+        return None if np.isnan(score) else float(score)
+    
+    def _calculate_permission_score(self, result_scopes: frozenset, scope_set: Optional[frozenset]) -> Optional[float]:
+        """Calculate permission fit score against the user's scopes"""
+        if not scope_set:
             return None
         
-        result_scopes = result.get("scopes", [])
         if not result_scopes:
             return None
         
         # Calculate overlap between user scopes and result scopes
-        overlap = len(set(filters.scope_ids) & set(result_scopes))
-        total_user_scopes = len(filters.scope_ids)
+        overlap = len(scope_set.intersection(result_scopes))
         
-        if total_user_scopes == 0:
-            return None
-        
-        return overlap / total_user_scopes
+        return overlap / len(scope_set)
     
     def _calculate_historical_score(self, result: Dict[str, Any]) -> Optional[float]:
         """Calculate historical success score"""
@@ -339,108 +492,13 @@ class SearchService:
         # For now, return a default score
         return 0.5
     
-    def _calculate_final_score(
-        self,
-        relevance_score: float,
-        performance_score: Optional[float],
-        geographic_score: Optional[float],
-        freshness_score: Optional[float],
-        permission_score: Optional[float],
-        historical_score: Optional[float],
-        popularity_score: Optional[float]
-    ) -> float:
-        """Calculate final weighted score using SOLAR-style approach"""
-        
-        # Weights for different factors
-        weights = {
-            "relevance": 0.4,
-            "performance": 0.15,
-            "geographic": 0.1,
-            "freshness": 0.1,
-            "permission": 0.15,
-            "historical": 0.05,
-            "popularity": 0.05
-        }
-        
-        final_score = relevance_score * weights["relevance"]
-        
-        if performance_score is not None:
-            final_score += performance_score * weights["performance"]
-        
-        if geographic_score is not None:
-            final_score += geographic_score * weights["geographic"]
-        
-        if freshness_score is not None:
-            final_score += freshness_score * weights["freshness"]
-        
-        if permission_score is not None:
-            final_score += permission_score * weights["permission"]
-        
-        if historical_score is not None:
-            final_score += historical_score * weights["historical"]
-        
-        if popularity_score is not None:
-            final_score += popularity_score * weights["popularity"]
-        
-        return min(final_score, 1.0)
-    
-    def _generate_citations(self, results: List[SearchResult]) -> List[Citation]:
-        """Generate citations for search results"""
-        citations = []
-        
-        for result in results:
-            if result.citations:
-                citations.extend(result.citations)
-        
-        return citations
-    
     def _build_vector_filters(self, filters: Optional[SearchFilter]) -> Dict[str, Any]:
         """Build filters for vector search"""
-        if not filters:
-            return {}
-        
-        vector_filters = {}
-        
-        if filters.environments:
-            vector_filters["environment"] = {"$in": [env.value for env in filters.environments]}
-        
-        if filters.api_styles:
-            vector_filters["api_style"] = {"$in": [style.value for style in filters.api_styles]}
-        
-        if filters.systems:
-            vector_filters["system_name"] = {"$in": filters.systems}
-        
-        if filters.services:
-            vector_filters["service_name"] = {"$in": filters.services}
-        
-        if filters.tags:
-            vector_filters["tags"] = {"$in": filters.tags}
-        
-        if filters.pii_flagged is not None:
-            vector_filters["pii_flagged"] = filters.pii_flagged
-        
-        if filters.regions:
-            vector_filters["region"] = {"$in": filters.regions}
-        
-        return vector_filters
+        return filters.vector_filter_dict if filters else {}
     
     def _serialize_filters(self, filters: Optional[SearchFilter]) -> Dict[str, Any]:
         """Serialize filters for response"""
-        if not filters:
-            return {}
-        
-        return {
-            "environments": [env.value for env in filters.environments] if filters.environments else None,
-            "api_styles": [style.value for style in filters.api_styles] if filters.api_styles else None,
-            "systems": filters.systems,
-            "services": filters.services,
-            "tags": filters.tags,
-            "pii_flagged": filters.pii_flagged,
-            "regions": filters.regions,
-            "latency_max_ms": filters.latency_max_ms,
-            "availability_min": filters.availability_min,
-            "scope_ids": filters.scope_ids
-        }
+        return filters.serialized if filters else {}
     
     async def record_feedback(
         self,
@@ -453,7 +511,10 @@ class SearchService:
         """Record user feedback for search results"""
         try:
             # This would store feedback in a database for improving ranking
-            logger.info(f"Feedback recorded: query='{query}', chosen={chosen_result_id}, label={label}, user={user_id}")
+            logger.info(
+                "Feedback recorded: query='{}', chosen={}, label={}, user={}",
+                query, chosen_result_id, label, user_id
+            )
             
             # Could trigger model retraining or ranking adjustment
             await self._update_ranking_weights(query, chosen_result_id, candidate_ids, label)
@@ -472,4 +533,4 @@ class SearchService:
         """Update ranking weights based on feedback"""
         # This would implement adaptive ranking weight adjustment
         # For now, just log the feedback
-        logger.info(f"Updating ranking weights for query: {query}")
+        logger.info("Updating ranking weights for query: {}", query)
@@ -4,15 +4,482 @@ Demonstration: How CatalystAI Responds to Complex Product Requirements
 Supply Chain Forecasting Feature Request Example
 """
 
+import asyncio
+import hashlib
 import json
+import sys
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Callable, Dict, List, Any, Mapping, Optional, Sequence, Tuple
+
+# Section separators
+_RULE50 = "-" * 50
+_RULE80 = "=" * 80
+
+# Response content is the same for every call, so it is built once at import.
+# Dicts are read-only views, sequences are tuples and keys are the display labels.
+# Sections that mix dicts and lists are ("dict" | "list", name, payload) entries.
+
+_QUERY_ANALYSIS = MappingProxyType({
+    "Primary Intent": "Supply Chain Forecasting API Discovery",
+    "Key Entities": (
+        "vendorId (input parameter)",
+        "supply chain forecasting (business function)",
+        "2500 TPS (performance requirement)",
+        "UI integration (implementation context)"
+    ),
+    "Search Dimensions": (
+        "API Discovery: Supply chain forecasting endpoints",
+        "Performance: High-throughput API support",
+        "Integration: Best practices and patterns",
+        "Infrastructure: Capacity planning and scaling"
+    ),
+    "Business Context": "New feature development requiring external API integration"
+})
+
+_DISCOVERED_APIS = (
+    {
+        "api_name": "Supply Chain Forecasting API",
+        "service": "SupplyChainService",
+        "system": "Supply Chain Management",
+        "endpoints": (
+            {
+                "method": "POST",
+                "path": "/api/v1/forecasting/generate",
+                "description": "Generate supply chain forecasts based on vendor data",
+                "relevance_score": 0.95,
+                "performance_score": 0.88,
+                "supports_vendor_id": True
+            },
+            {
+                "method": "GET",
+                "path": "/api/v1/forecasting/history/{vendorId}",
+                "description": "Retrieve historical forecasting data for vendor",
+                "relevance_score": 0.92,
+                "performance_score": 0.85,
+                "supports_vendor_id": True
+            }
+        ),
+        "citations": (
+            "OpenAPI spec: supply-chain-api.yaml (lines 45-67)",
+            "Integration guide: supply-chain-forecasting.md (section 3.2)"
+        )
+    },
+    {
+        "api_name": "Vendor Management API",
+        "service": "VendorService",
+        "system": "Vendor Management",
+        "endpoints": (
+            {
+                "method": "GET",
+                "path": "/api/v1/vendors/{vendorId}",
+                "description": "Get vendor details and capabilities",
+                "relevance_score": 0.89,
+                "performance_score": 0.92,
+                "supports_vendor_id": True
+            },
+        ),
+        "citations": (
+            "Postman collection: vendor-management.postman_collection.json",
+            "API documentation: vendor-api-spec.yaml"
+        )
+    },
+    {
+        "api_name": "Supply Chain Analytics API",
+        "service": "AnalyticsService",
+        "system": "Business Intelligence",
+        "endpoints": (
+            {
+                "method": "POST",
+                "path": "/api/v1/analytics/supply-chain/insights",
+                "description": "Get supply chain insights and recommendations",
+                "relevance_score": 0.87,
+                "performance_score": 0.78,
+                "supports_vendor_id": True
+            },
+        ),
+        "citations": (
+            "GraphQL schema: supply-chain-analytics.graphql",
+            "Documentation: analytics-api-guide.md"
+        )
+    }
+)
+
+_ONBOARDING_REQUIREMENTS = MappingProxyType({
+    "Supply Chain Forecasting API": {
+        "Required Scopes": ("supply-chain:read", "forecasting:write"),
+        "Authentication": "OAuth 2.0 with JWT",
+        "Rate Limits": "5000 requests/hour, 100 requests/minute",
+        "Approval Required": "Yes - Business justification needed",
+        "Estimated Timeline": "3-5 business days",
+        "Dependencies": ("Vendor Management API access",)
+    },
+    "Vendor Management API": {
+        "Required Scopes": ("vendor:read",),
+        "Authentication": "OAuth 2.0 with JWT",
+        "Rate Limits": "10000 requests/hour, 200 requests/minute",
+        "Approval Required": "No - Standard access",
+        "Estimated Timeline": "1-2 business days",
+        "Dependencies": ()
+    },
+    "Supply Chain Analytics API": {
+        "Required Scopes": ("analytics:read", "supply-chain:read"),
+        "Authentication": "OAuth 2.0 with JWT",
+        "Rate Limits": "2000 requests/hour, 50 requests/minute",
+        "Approval Required": "Yes - Data access review",
+        "Estimated Timeline": "5-7 business days",
+        "Dependencies": ("Supply Chain Forecasting API access",)
+    }
+})
+
+_INTEGRATION_RECOMMENDATIONS = MappingProxyType({
+    "Architecture Patterns": (
+        "Implement Circuit Breaker pattern for API resilience",
+        "Use Async/Await for non-blocking API calls",
+        "Implement request/response caching with Redis",
+        "Use connection pooling for HTTP clients"
+    ),
+    "Performance Optimizations": (
+        "Batch API calls where possible to reduce overhead",
+        "Implement request deduplication for identical vendor requests",
+        "Use connection keep-alive for HTTP connections",
+        "Implement client-side rate limiting"
+    ),
+    "Error Handling": (
+        "Implement exponential backoff for retries",
+        "Use circuit breaker for downstream service failures",
+        "Implement graceful degradation for non-critical APIs",
+        "Log all API interactions for debugging"
+    ),
+    "Security Best Practices": (
+        "Store API credentials securely (use Vault)",
+        "Implement request signing for sensitive operations",
+        "Use HTTPS for all API communications",
+        "Implement proper input validation and sanitization"
+    ),
+    "Monitoring & Observability": (
+        "Track API response times and success rates",
+        "Monitor rate limit usage and throttling",
+        "Implement distributed tracing (Jaeger/Zipkin)",
+        "Set up alerts for API failures and performance degradation"
+    )
+})
+
+_PERFORMANCE_ANALYSIS = (
+    ("dict", "Current API Capacity", {
+        "Supply Chain Forecasting API": "Supports 1000 TPS (needs scaling)",
+        "Vendor Management API": "Supports 3000 TPS (adequate)",
+        "Supply Chain Analytics API": "Supports 500 TPS (needs significant scaling)"
+    }),
+    ("dict", "Scaling Requirements", {
+        "Supply Chain Forecasting API": "2.5x capacity increase needed",
+        "Supply Chain Analytics API": "5x capacity increase needed",
+        "Infrastructure Changes": "Additional compute resources, load balancers"
+    }),
+    ("list", "Performance Recommendations", (
+        "Implement horizontal scaling for forecasting service",
+        "Add read replicas for analytics database",
+        "Implement request queuing for peak load handling",
+        "Use CDN for static forecasting data",
+        "Implement request batching to reduce API calls"
+    )),
+    ("dict", "Estimated Infrastructure Costs", {
+        "Additional Compute": "$2,000-5,000/month",
+        "Load Balancers": "$500-1,000/month",
+        "Database Scaling": "$1,000-3,000/month",
+        "Monitoring Tools": "$200-500/month"
+    })
+)
+
+
+_DOWNSTREAM_IMPACT = (
+    ("list", "Infrastructure Team", (
+        "Scale forecasting service from 1000 to 2500 TPS",
+        "Add load balancers and auto-scaling groups",
+        "Implement horizontal scaling for analytics service",
+        "Upgrade database instances and add read replicas"
+    )),
+    ("list", "Platform Team", (
+        "Update rate limiting policies for new TPS requirements",
+        "Implement request queuing and throttling mechanisms",
+        "Add monitoring and alerting for new services",
+        "Update API gateway configurations"
+    )),
+    ("list", "Security Team", (
+        "Review and approve new API access requests",
+        "Update security policies for increased traffic",
+        "Implement additional monitoring for security events",
+        "Review and approve new service deployments"
+    )),
+    ("list", "Data Team", (
+        "Optimize database queries for forecasting operations",
+        "Implement data partitioning for better performance",
+        "Add caching layers for frequently accessed data",
+        "Set up data backup and recovery procedures"
+    )),
+    ("dict", "Estimated Timeline", {
+        "Infrastructure Scaling": "2-3 weeks",
+        "Security Review": "1 week",
+        "Performance Testing": "1-2 weeks",
+        "Total Implementation": "4-6 weeks"
+    })
+)
+
+
+_NEXT_STEPS = (
+    {
+        "priority": "High",
+        "action": "Submit API access requests for all three services",
+        "owner": "Product Team",
+        "timeline": "Immediate"
+    },
+    {
+        "priority": "High",
+        "action": "Engage Infrastructure team for capacity planning",
+        "owner": "Product Team",
+        "timeline": "This week"
+    },
+    {
+        "priority": "Medium",
+        "action": "Design integration architecture with Engineering team",
+        "owner": "Engineering Team",
+        "timeline": "Next 2 weeks"
+    },
+    {
+        "priority": "Medium",
+        "action": "Create performance test plan for 2500 TPS",
+        "owner": "QA Team",
+        "timeline": "Next 2 weeks"
+    },
+    {
+        "priority": "Low",
+        "action": "Document integration patterns and best practices",
+        "owner": "Engineering Team",
+        "timeline": "Ongoing"
+    }
+)
+
+def _render_query_analysis(analysis: Mapping[str, Any]) -> str:
+    """Render how the query is analyzed"""
+    lines = []
+    lines.append("📊 **1. QUERY ANALYSIS & INTELLIGENT DECOMPOSITION**")
+    lines.append(_RULE50)
+    
+    for key, value in analysis.items():
+        if isinstance(value, tuple):
+            lines.append(f"{key}:")
+            for item in value:
+                lines.append(f"  • {item}")
+        else:
+            lines.append(f"{key}: {value}")
+    
+    lines.append("")
+    
+    return "\n".join(lines) + "\n"
+
+def _render_api_discovery_results(discovered_apis: Sequence[Mapping[str, Any]]) -> str:
+    """Render discovered APIs for supply chain forecasting"""
+    lines = []
+    lines.append("🔍 **2. API DISCOVERY RESULTS**")
+    lines.append(_RULE50)
+    
+    for i, api in enumerate(discovered_apis, 1):
+        lines.append(f"{i}. **{api['api_name']}** ({api['service']})")
+        lines.append(f"   System: {api['system']}")
+        lines.append(f"   Endpoints:")
+        for endpoint in api['endpoints']:
+            lines.append(f"     • {endpoint['method']} {endpoint['path']}")
+            lines.append(f"       {endpoint['description']}")
+            lines.append(f"       Relevance: {endpoint['relevance_score']:.2f}, Performance: {endpoint['performance_score']:.2f}")
+        lines.append(f"   Citations: {len(api['citations'])} sources")
+        lines.append("")
+    
+    return "\n".join(lines) + "\n"
+
+def _render_onboarding_requirements(onboarding_requirements: Mapping[str, Mapping[str, Any]]) -> str:
+    """Render onboarding requirements for discovered APIs"""
+    lines = []
+    lines.append("🚀 **3. ONBOARDING REQUIREMENTS**")
+    lines.append(_RULE50)
+    
+    for api_name, requirements in onboarding_requirements.items():
+        lines.append(f"**{api_name}**")
+        for key, value in requirements.items():
+            if isinstance(value, tuple):
+                lines.append(f"  {key}: {', '.join(value)}")
+            else:
+                lines.append(f"  {key}: {value}")
+        lines.append("")
+    
+    return "\n".join(lines) + "\n"
+
+def _render_integration_recommendations(recommendations: Mapping[str, Sequence[str]]) -> str:
+    """Render integration best practices and recommendations"""
+    lines = []
+    lines.append("📚 **4. INTEGRATION RECOMMENDATIONS & BEST PRACTICES**")
+    lines.append(_RULE50)
+    
+    for category, items in recommendations.items():
+        lines.append(f"**{category}**")
+        for item in items:
+            lines.append(f"  • {item}")
+        lines.append("")
+    
+    return "\n".join(lines) + "\n"
+
+def _render_performance_analysis(performance_analysis: Sequence[Tuple[str, str, Any]]) -> str:
+    """Render performance analysis for 2500 TPS requirement"""
+    lines = []
+    lines.append("⚡ **5. PERFORMANCE ANALYSIS (2500 TPS REQUIREMENT)**")
+    lines.append(_RULE50)
+    
+    for kind, category, details in performance_analysis:
+        lines.append(f"**{category}**")
+        if kind == "dict":
+            for key, value in details.items():
+                lines.append(f"  {key}: {value}")
+        else:
+            for item in details:
+                lines.append(f"  • {item}")
+        lines.append("")
+    
+    return "\n".join(lines) + "\n"
+
+def _render_downstream_impact(downstream_impact: Sequence[Tuple[str, str, Any]]) -> str:
+    """Render downstream impact and required changes"""
+    lines = []
+    lines.append("🔄 **6. DOWNSTREAM IMPACT & REQUIRED CHANGES**")
+    lines.append(_RULE50)
+    
+    for kind, team, changes in downstream_impact:
+        if kind == "list":
+            lines.append(f"**{team}**")
+            for change in changes:
+                lines.append(f"  • {change}")
+            lines.append("")
+        else:
+            lines.append(f"**{team}**")
+            for key, value in changes.items():
+                lines.append(f"  {key}: {value}")
+            lines.append("")
+    
+    return "\n".join(lines) + "\n"
+
+def _render_next_steps(next_steps: Sequence[Mapping[str, str]]) -> str:
+    """Render actionable next steps"""
+    lines = []
+    lines.append("🎯 **7. ACTIONABLE NEXT STEPS**")
+    lines.append(_RULE50)
+    
+    for step in next_steps:
+        lines.append(f"**{step['priority']} Priority**")
+        lines.append(f"  Action: {step['action']}")
+        lines.append(f"  Owner: {step['owner']}")
+        lines.append(f"  Timeline: {step['timeline']}")
+        lines.append("")
+    
+    lines.append("📋 **SUMMARY**")
+    lines.append(_RULE50)
+    lines.append("✅ **3 APIs identified** for supply chain forecasting")
+    lines.append("⚠️  **2 APIs need scaling** to support 2500 TPS")
+    lines.append("🚀 **Onboarding timeline**: 1-7 business days")
+    lines.append("💰 **Estimated cost**: $3,700-9,500/month additional")
+    lines.append("⏱️  **Implementation timeline**: 4-6 weeks")
+    lines.append("")
+    lines.append("🎉 **Ready to proceed with API integration!**")
+    
+    return "\n".join(lines) + "\n"
+
+# Each section is rendered once at import; the demo only copies the strings out
+_QUERY_ANALYSIS_RENDERED = _render_query_analysis(_QUERY_ANALYSIS)
+_DISCOVERED_APIS_RENDERED = _render_api_discovery_results(_DISCOVERED_APIS)
+_ONBOARDING_REQUIREMENTS_RENDERED = _render_onboarding_requirements(_ONBOARDING_REQUIREMENTS)
+_INTEGRATION_RECOMMENDATIONS_RENDERED = _render_integration_recommendations(_INTEGRATION_RECOMMENDATIONS)
+_PERFORMANCE_ANALYSIS_RENDERED = _render_performance_analysis(_PERFORMANCE_ANALYSIS)
+_DOWNSTREAM_IMPACT_RENDERED = _render_downstream_impact(_DOWNSTREAM_IMPACT)
+_NEXT_STEPS_RENDERED = _render_next_steps(_NEXT_STEPS)
+
+def _write_stdout(text: str):
+    """Write text to stdout and flush it"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+class _StdoutSink:
+    """Async stdout writer; blocking writes run in a worker thread, at most max_writers at a time"""
+    
+    def __init__(self, max_writers: int = 4):
+        self._slots = asyncio.Semaphore(max_writers)
+    
+    async def write(self, text: str):
+        async with self._slots:
+            await asyncio.to_thread(_write_stdout, text)
+
+def _query_key(query: str) -> bytes:
+    """Cache key for a query; whitespace and case differences map to the same key"""
+    normalized = " ".join(query.split()).casefold()
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+class _ResponseCache:
+    """LRU cache of rendered responses with a TTL and a stale-while-revalidate window
+    
+    Entries younger than ttl are served as-is. Entries up to stale_ttl past
+    that are still served, but a background refresh is scheduled. Older
+    entries are treated as misses.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0, stale_ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._refresh_tasks: Dict[bytes, asyncio.Task] = {}
+    
+    def get(self, key: bytes) -> Tuple[Optional[str], bool]:
+        """Return (text, is_stale), or (None, False) on a miss"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        
+        stored_at, text = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None, False
+        
+        self._entries.move_to_end(key)
+        return text, age > self.ttl
+    
+    def set(self, key: bytes, text: str):
+        self._entries[key] = (time.monotonic(), text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def schedule_refresh(self, key: bytes, render: Callable[[], str]):
+        """Re-render a stale entry in the background, once per key"""
+        if key in self._refresh_tasks:
+            return
+        
+        task = asyncio.get_running_loop().create_task(self._refresh(key, render))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+    
+    async def _refresh(self, key: bytes, render: Callable[[], str]):
+        self.set(key, render())
+
+_RESPONSE_CACHE = _ResponseCache()
+
+# Renders in progress by query key. Concurrent misses for the same query await
+# the first render instead of repeating it; the dict is only touched on the
+# event loop, so no lock is needed around it.
+_INFLIGHT: Dict[bytes, asyncio.Future] = {}
 
 class CatalystAIResponseDemo:
     """Demonstrates how CatalystAI responds to complex product requirements"""
     
-    def __init__(self):
-        self.query = """
+    DEFAULT_QUERY = """
         I am building a new feature from UI where I have vendorId and I need generate 
         forecasting in supply chain, which APIs I need to consume and any onboarding 
         required, Do Our app need to follow any recommendations and practices when 
@@ -20,12 +487,74 @@ class CatalystAIResponseDemo:
         support this and any changes they need to do to support this additional traffic
         """
     
-    def demonstrate_response(self):
-        """Show how CatalystAI would respond to this query"""
+    def __init__(self, query: Optional[str] = None):
+        self.query = query or self.DEFAULT_QUERY
+        # Output is collected here and written to the sink in one call
+        self._buf: List[str] = []
+    
+    def _emit(self, line: str = ""):
+        """Buffer one line of output"""
+        self._buf.append(line)
+        self._buf.append("\n")
+    
+    async def demonstrate_response(self, stream: Optional[Any] = None):
+        """Show how CatalystAI would respond to this query
+        
+        stream is any object with an async write(str), e.g. an aiofiles file;
+        stdout is used when it is omitted.
+        """
+        if stream is None:
+            stream = _StdoutSink()
+        await stream.write(await self._get_response())
+    
+    @classmethod
+    async def demonstrate_batch(cls, queries: Sequence[str], stream: Optional[Any] = None):
+        """Show the responses for many queries with a single write
+        
+        The sections are shared pre-rendered constants and repeated queries
+        hit the response cache, so each query only costs its own lookup.
+        """
+        if stream is None:
+            stream = _StdoutSink()
+        responses = await asyncio.gather(*(cls(query)._get_response() for query in queries))
+        await stream.write("".join(responses))
+    
+    async def _get_response(self) -> str:
+        """Return the rendered response, from the cache when possible"""
+        key = _query_key(self.query)
+        text, stale = _RESPONSE_CACHE.get(key)
+        
+        if text is not None:
+            if stale:
+                _RESPONSE_CACHE.schedule_refresh(key, self._render_response)
+            return text
+        
+        inflight = _INFLIGHT.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[key] = future
+        try:
+            text = await asyncio.to_thread(self._render_response)
+            _RESPONSE_CACHE.set(key, text)
+            future.set_result(text)
+            return text
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved in case nobody else was waiting
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            _INFLIGHT.pop(key, None)
+    
+    def _render_response(self) -> str:
+        """Build the full response text"""
         
-        print("🔍 **CatalystAI Response to Supply Chain Forecasting Requirement**")
-        print("=" * 80)
-        print()
+        self._emit("🔍 **CatalystAI Response to Supply Chain Forecasting Requirement**")
+        self._emit(_RULE80)
+        self._emit()
         
         # 1. Query Analysis
         self._show_query_analysis()
@@ -47,358 +576,48 @@ class CatalystAIResponseDemo:
         
         # 7. Actionable Next Steps
         self._show_next_steps()
+        
+        text = "".join(self._buf)
+        self._buf.clear()
+        return text
     
     def _show_query_analysis(self):
         """Show how the query is analyzed"""
-        print("📊 **1. QUERY ANALYSIS & INTELLIGENT DECOMPOSITION**")
-        print("-" * 50)
-        
-        analysis = {
-            "primary_intent": "Supply Chain Forecasting API Discovery",
-            "key_entities": [
-                "vendorId (input parameter)",
-                "supply chain forecasting (business function)",
-                "2500 TPS (performance requirement)",
-                "UI integration (implementation context)"
-            ],
-            "search_dimensions": [
-                "API Discovery: Supply chain forecasting endpoints",
-                "Performance: High-throughput API support",
-                "Integration: Best practices and patterns",
-                "Infrastructure: Capacity planning and scaling"
-            ],
-            "business_context": "New feature development requiring external API integration"
-        }
-        
-        for key, value in analysis.items():
-            if isinstance(value, list):
-                print(f"{key.replace('_', ' ').title()}:")
-                for item in value:
-                    print(f"  • {item}")
-            else:
-                print(f"{key.replace('_', ' ').title()}: {value}")
-        
-        print()
+        self._buf.append(_QUERY_ANALYSIS_RENDERED)
     
     def _show_api_discovery_results(self):
         """Show discovered APIs for supply chain forecasting"""
-        print("🔍 **2. API DISCOVERY RESULTS**")
-        print("-" * 50)
-        
-        discovered_apis = [
-            {
-                "api_name": "Supply Chain Forecasting API",
-                "service": "SupplyChainService",
-                "system": "Supply Chain Management",
-                "endpoints": [
-                    {
-                        "method": "POST",
-                        "path": "/api/v1/forecasting/generate",
-                        "description": "Generate supply chain forecasts based on vendor data",
-                        "relevance_score": 0.95,
-                        "performance_score": 0.88,
-                        "supports_vendor_id": True
-                    },
-                    {
-                        "method": "GET",
-                        "path": "/api/v1/forecasting/history/{vendorId}",
-                        "description": "Retrieve historical forecasting data for vendor",
-                        "relevance_score": 0.92,
-                        "performance_score": 0.85,
-                        "supports_vendor_id": True
-                    }
-                ],
-                "citations": [
-                    "OpenAPI spec: supply-chain-api.yaml (lines 45-67)",
-                    "Integration guide: supply-chain-forecasting.md (section 3.2)"
-                ]
-            },
-            {
-                "api_name": "Vendor Management API",
-                "service": "VendorService",
-                "system": "Vendor Management",
-                "endpoints": [
-                    {
-                        "method": "GET",
-                        "path": "/api/v1/vendors/{vendorId}",
-                        "description": "Get vendor details and capabilities",
-                        "relevance_score": 0.89,
-                        "performance_score": 0.92,
-                        "supports_vendor_id": True
-                    }
-                ],
-                "citations": [
-                    "Postman collection: vendor-management.postman_collection.json",
-                    "API documentation: vendor-api-spec.yaml"
-                ]
-            },
-            {
-                "api_name": "Supply Chain Analytics API",
-                "service": "AnalyticsService",
-                "system": "Business Intelligence",
-                "endpoints": [
-                    {
-                        "method": "POST",
-                        "path": "/api/v1/analytics/supply-chain/insights",
-                        "description": "Get supply chain insights and recommendations",
-                        "relevance_score": 0.87,
-                        "performance_score": 0.78,
-                        "supports_vendor_id": True
-                    }
-                ],
-                "citations": [
-                    "GraphQL schema: supply-chain-analytics.graphql",
-                    "Documentation: analytics-api-guide.md"
-                ]
-            }
-        ]
-        
-        for i, api in enumerate(discovered_apis, 1):
-            print(f"{i}. **{api['api_name']}** ({api['service']})")
-            print(f"   System: {api['system']}")
-            print(f"   Endpoints:")
-            for endpoint in api['endpoints']:
-                print(f"     • {endpoint['method']} {endpoint['path']}")
-                print(f"       {endpoint['description']}")
-                print(f"       Relevance: {endpoint['relevance_score']:.2f}, Performance: {endpoint['performance_score']:.2f}")
-            print(f"   Citations: {len(api['citations'])} sources")
-            print()
+        self._buf.append(_DISCOVERED_APIS_RENDERED)
     
     def _show_onboarding_requirements(self):
         """Show onboarding requirements for discovered APIs"""
-        print("🚀 **3. ONBOARDING REQUIREMENTS**")
-        print("-" * 50)
-        
-        onboarding_requirements = {
-            "Supply Chain Forecasting API": {
-                "required_scopes": ["supply-chain:read", "forecasting:write"],
-                "authentication": "OAuth 2.0 with JWT",
-                "rate_limits": "5000 requests/hour, 100 requests/minute",
-                "approval_required": "Yes - Business justification needed",
-                "estimated_timeline": "3-5 business days",
-                "dependencies": ["Vendor Management API access"]
-            },
-            "Vendor Management API": {
-                "required_scopes": ["vendor:read"],
-                "authentication": "OAuth 2.0 with JWT",
-                "rate_limits": "10000 requests/hour, 200 requests/minute",
-                "approval_required": "No - Standard access",
-                "estimated_timeline": "1-2 business days",
-                "dependencies": []
-            },
-            "Supply Chain Analytics API": {
-                "required_scopes": ["analytics:read", "supply-chain:read"],
-                "authentication": "OAuth 2.0 with JWT",
-                "rate_limits": "2000 requests/hour, 50 requests/minute",
-                "approval_required": "Yes - Data access review",
-                "estimated_timeline": "5-7 business days",
-                "dependencies": ["Supply Chain Forecasting API access"]
-            }
-        }
-        
-        for api_name, requirements in onboarding_requirements.items():
-            print(f"**{api_name}**")
-            for key, value in requirements.items():
-                if isinstance(value, list):
-                    print(f"  {key.replace('_', ' ').title()}: {', '.join(value)}")
-                else:
-                    print(f"  {key.replace('_', ' ').title()}: {value}")
-            print()
+        self._buf.append(_ONBOARDING_REQUIREMENTS_RENDERED)
     
     def _show_integration_recommendations(self):
         """Show integration best practices and recommendations"""
-        print("📚 **4. INTEGRATION RECOMMENDATIONS & BEST PRACTICES**")
-        print("-" * 50)
-        
-        recommendations = {
-            "Architecture Patterns": [
-                "Implement Circuit Breaker pattern for API resilience",
-                "Use Async/Await for non-blocking API calls",
-                "Implement request/response caching with Redis",
-                "Use connection pooling for HTTP clients"
-            ],
-            "Performance Optimizations": [
-                "Batch API calls where possible to reduce overhead",
-                "Implement request deduplication for identical vendor requests",
-                "Use connection keep-alive for HTTP connections",
-                "Implement client-side rate limiting"
-            ],
-            "Error Handling": [
-                "Implement exponential backoff for retries",
-                "Use circuit breaker for downstream service failures",
-                "Implement graceful degradation for non-critical APIs",
-                "Log all API interactions for debugging"
-            ],
-            "Security Best Practices": [
-                "Store API credentials securely (use Vault)",
-                "Implement request signing for sensitive operations",
-                "Use HTTPS for all API communications",
-                "Implement proper input validation and sanitization"
-            ],
-            "Monitoring & Observability": [
-                "Track API response times and success rates",
-                "Monitor rate limit usage and throttling",
-                "Implement distributed tracing (Jaeger/Zipkin)",
-                "Set up alerts for API failures and performance degradation"
-            ]
-        }
-        
-        for category, items in recommendations.items():
-            print(f"**{category}**")
-            for item in items:
-                print(f"  • {item}")
-            print()
+        self._buf.append(_INTEGRATION_RECOMMENDATIONS_RENDERED)
     
     def _show_performance_analysis(self):
         """Show performance analysis for 2500 TPS requirement"""
-        print("⚡ **5. PERFORMANCE ANALYSIS (2500 TPS REQUIREMENT)**")
-        print("-" * 50)
-        
-        performance_analysis = {
-            "Current API Capacity": {
-                "Supply Chain Forecasting API": "Supports 1000 TPS (needs scaling)",
-                "Vendor Management API": "Supports 3000 TPS (adequate)",
-                "Supply Chain Analytics API": "Supports 500 TPS (needs significant scaling)"
-            },
-            "Scaling Requirements": {
-                "Supply Chain Forecasting API": "2.5x capacity increase needed",
-                "Supply Chain Analytics API": "5x capacity increase needed",
-                "Infrastructure Changes": "Additional compute resources, load balancers"
-            },
-            "Performance Recommendations": [
-                "Implement horizontal scaling for forecasting service",
-                "Add read replicas for analytics database",
-                "Implement request queuing for peak load handling",
-                "Use CDN for static forecasting data",
-                "Implement request batching to reduce API calls"
-            ],
-            "Estimated Infrastructure Costs": {
-                "Additional Compute": "$2,000-5,000/month",
-                "Load Balancers": "$500-1,000/month",
-                "Database Scaling": "$1,000-3,000/month",
-                "Monitoring Tools": "$200-500/month"
-            }
-        }
-        
-        for category, details in performance_analysis.items():
-            print(f"**{category}**")
-            if isinstance(details, dict):
-                for key, value in details.items():
-                    print(f"  {key}: {value}")
-            elif isinstance(details, list):
-                for item in details:
-                    print(f"  • {item}")
-            print()
+        self._buf.append(_PERFORMANCE_ANALYSIS_RENDERED)
     
     def _show_downstream_impact(self):
         """Show downstream impact and required changes"""
-        print("🔄 **6. DOWNSTREAM IMPACT & REQUIRED CHANGES**")
-        print("-" * 50)
-        
-        downstream_impact = {
-            "Infrastructure Team": [
-                "Scale forecasting service from 1000 to 2500 TPS",
-                "Add load balancers and auto-scaling groups",
-                "Implement horizontal scaling for analytics service",
-                "Upgrade database instances and add read replicas"
-            ],
-            "Platform Team": [
-                "Update rate limiting policies for new TPS requirements",
-                "Implement request queuing and throttling mechanisms",
-                "Add monitoring and alerting for new services",
-                "Update API gateway configurations"
-            ],
-            "Security Team": [
-                "Review and approve new API access requests",
-                "Update security policies for increased traffic",
-                "Implement additional monitoring for security events",
-                "Review and approve new service deployments"
-            ],
-            "Data Team": [
-                "Optimize database queries for forecasting operations",
-                "Implement data partitioning for better performance",
-                "Add caching layers for frequently accessed data",
-                "Set up data backup and recovery procedures"
-            ],
-            "Estimated Timeline": {
-                "Infrastructure Scaling": "2-3 weeks",
-                "Security Review": "1 week",
-                "Performance Testing": "1-2 weeks",
-                "Total Implementation": "4-6 weeks"
-            }
-        }
-        
-        for team, changes in downstream_impact.items():
-            if isinstance(changes, list):
-                print(f"**{team}**")
-                for change in changes:
-                    print(f"  • {change}")
-                print()
-            else:
-                print(f"**{team}**")
-                for key, value in changes.items():
-                    print(f"  {key}: {value}")
-                print()
+        self._buf.append(_DOWNSTREAM_IMPACT_RENDERED)
     
     def _show_next_steps(self):
         """Show actionable next steps"""
-        print("🎯 **7. ACTIONABLE NEXT STEPS**")
-        print("-" * 50)
-        
-        next_steps = [
-            {
-                "priority": "High",
-                "action": "Submit API access requests for all three services",
-                "owner": "Product Team",
-                "timeline": "Immediate"
-            },
-            {
-                "priority": "High",
-                "action": "Engage Infrastructure team for capacity planning",
-                "owner": "Product Team",
-                "timeline": "This week"
-            },
-            {
-                "priority": "Medium",
-                "action": "Design integration architecture with Engineering team",
-                "owner": "Engineering Team",
-                "timeline": "Next 2 weeks"
-            },
-            {
-                "priority": "Medium",
-                "action": "Create performance test plan for 2500 TPS",
-                "owner": "QA Team",
-                "timeline": "Next 2 weeks"
-            },
-            {
-                "priority": "Low",
-                "action": "Document integration patterns and best practices",
-                "owner": "Engineering Team",
-                "timeline": "Ongoing"
-            }
-        ]
-        
-        for step in next_steps:
-            print(f"**{step['priority']} Priority**")
-            print(f"  Action: {step['action']}")
-            print(f"  Owner: {step['owner']}")
-            print(f"  Timeline: {step['timeline']}")
-            print()
-        
-        print("📋 **SUMMARY**")
-        print("-" * 50)
-        print("✅ **3 APIs identified** for supply chain forecasting")
-        print("⚠️  **2 APIs need scaling** to support 2500 TPS")
-        print("🚀 **Onboarding timeline**: 1-7 business days")
-        print("💰 **Estimated cost**: $3,700-9,500/month additional")
-        print("⏱️  **Implementation timeline**: 4-6 weeks")
-        print()
-        print("🎉 **Ready to proceed with API integration!**")
+        self._buf.append(_NEXT_STEPS_RENDERED)
+
+async def _amain():
+    """Run the demos concurrently, sharing one stdout sink"""
+    demos = [CatalystAIResponseDemo()]
+    stream = _StdoutSink()
+    await asyncio.gather(*(demo.demonstrate_response(stream) for demo in demos))
 
 def main():
     """Main demonstration function"""
-    demo = CatalystAIResponseDemo()
-    demo.demonstrate_response()
+    asyncio.run(_amain())
 
 if __name__ == "__main__":
     main()
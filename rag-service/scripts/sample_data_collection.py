@@ -2,190 +2,177 @@
 """
 Sample Data Collection Script for CatalystAI RAG Service
 Demonstrates how to collect and ingest sample API data
+
+Run from the rag-service directory: python -m scripts.sample_data_collection
 """
 
+import argparse
 import asyncio
+import functools
+import hashlib
 import json
+import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-# Add the app directory to the Python path
-sys.path.append(str(Path(__file__).parent.parent / "app"))
+import aiofiles
+import aiofiles.os
+import yaml
 
-from models.requests import DocumentMetadata, DocumentType, Environment
-from services.document_service import DocumentService
-from services.embedding_service import EmbeddingService
-from services.chunking_service import ChunkingService
+# libyaml-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
 
-class SampleDataCollector:
-    """Collects and processes sample API data for testing"""
-    
-    def __init__(self):
-        self.document_service = DocumentService()
-        self.embedding_service = EmbeddingService()
-        self.chunking_service = ChunkingService()
-        
-        # Sample data directory
-        self.sample_data_dir = Path(__file__).parent / "sample_data"
-        self.sample_data_dir.mkdir(exist_ok=True)
-    
-    async def collect_sample_data(self):
-        """Collect and process sample API data"""
-        print("🚀 Starting sample data collection for CatalystAI...")
-        
-        try:
-            # Create sample OpenAPI specification
-            await self._create_sample_openapi()
-            
-            # Create sample GraphQL schema
-            await self._create_sample_graphql()
-            
-            # Create sample SOAP/WSDL
-            await self._create_sample_soap()
-            
-            # Create sample markdown documentation
-            await self._create_sample_markdown()
-            
-            # Create sample Postman collection
-            await self._create_sample_postman()
-            
-            # Create sample HAR file
-            await self._create_sample_har()
-            
-            print("✅ Sample data collection completed successfully!")
-            print(f"📁 Sample data saved to: {self.sample_data_dir}")
-            
-        except Exception as e:
-            print(f"❌ Error during data collection: {str(e)}")
-            raise
-    
-    async def _create_sample_openapi(self):
-        """Create sample OpenAPI specification"""
-        print("📝 Creating sample OpenAPI specification...")
-        
-        openapi_spec = {
-            "openapi": "3.0.3",
-            "info": {
-                "title": "Customer Banking API",
-                "version": "1.0.0",
-                "description": "API for customer banking operations including balances, transactions, and payments"
-            },
-            "servers": [
-                {"url": "https://api.bank.com/v1", "description": "Production server"},
-                {"url": "https://api-staging.bank.com/v1", "description": "Staging server"}
-            ],
-            "paths": {
-                "/customers/{customerId}/balance": {
-                    "get": {
-                        "operationId": "getCustomerBalance",
-                        "summary": "Get customer account balance",
-                        "description": "Retrieves the current balance for a specific customer account",
-                        "parameters": [
-                            {
-                                "name": "customerId",
-                                "in": "path",
-                                "required": True,
-                                "schema": {"type": "string"},
-                                "description": "Unique identifier for the customer"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Successful response",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "object",
-                                            "properties": {
-                                                "balance": {"type": "number", "format": "decimal"},
-                                                "currency": {"type": "string"},
-                                                "lastUpdated": {"type": "string", "format": "date-time"}
-                                            }
-                                        }
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.core.config import settings
+from app.models.requests import DocumentMetadata, DocumentType, Environment
+from app.services.document_service import DocumentService
+from app.services.embedding_service import EmbeddingService
+from app.services.chunking_service import ChunkingService
+
+# Progress output goes through one logging handler instead of a print per line
+log = logging.getLogger("catalyst.sampledata")
+
+def _chunk_worker(content: str, metadata: DocumentMetadata, chunk_size: int, chunk_overlap: int) -> List[Dict[str, Any]]:
+    """Chunk a document in a worker process (module-level so it can be pickled)"""
+    return ChunkingService().create_chunks(
+        content=content,
+        metadata=metadata,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
+def _dump_json(obj: Any) -> bytes:
+    """Serialize obj as indented JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+# Sample payloads are fixed, so they are built once at import
+
+# Fragments repeated across the OpenAPI paths are shared objects, which the
+# YAML dumper writes once as an anchor and then as aliases
+_BEARER_SECURITY = [{"bearerAuth": []}]
+_DATE_TIME_SCHEMA = {"type": "string", "format": "date-time"}
+
+_OPENAPI_SPEC = {
+    "openapi": "3.0.3",
+    "info": {
+        "title": "Customer Banking API",
+        "version": "1.0.0",
+        "description": "API for customer banking operations including balances, transactions, and payments"
+    },
+    "servers": [
+        {"url": "https://api.bank.com/v1", "description": "Production server"},
+        {"url": "https://api-staging.bank.com/v1", "description": "Staging server"}
+    ],
+    "paths": {
+        "/customers/{customerId}/balance": {
+            "get": {
+                "operationId": "getCustomerBalance",
+                "summary": "Get customer account balance",
+                "description": "Retrieves the current balance for a specific customer account",
+                "parameters": [
+                    {
+                        "name": "customerId",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "string"},
+                        "description": "Unique identifier for the customer"
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "Successful response",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "balance": {"type": "number", "format": "decimal"},
+                                        "currency": {"type": "string"},
+                                        "lastUpdated": _DATE_TIME_SCHEMA
                                     }
                                 }
                             }
-                        },
-                        "tags": ["Customer", "Balance"],
-                        "security": [{"bearerAuth": []}]
+                        }
                     }
                 },
-                "/transactions": {
-                    "get": {
-                        "operationId": "getTransactions",
-                        "summary": "Get transaction history",
-                        "description": "Retrieves transaction history with optional filtering",
-                        "parameters": [
-                            {
-                                "name": "customerId",
-                                "in": "query",
-                                "schema": {"type": "string"},
-                                "description": "Filter by customer ID"
-                            },
-                            {
-                                "name": "startDate",
-                                "in": "query",
-                                "schema": {"type": "string", "format": "date"},
-                                "description": "Start date for transaction range"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Successful response",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "array",
-                                            "items": {
-                                                "type": "object",
-                                                "properties": {
-                                                    "id": {"type": "string"},
-                                                    "amount": {"type": "number"},
-                                                    "description": {"type": "string"},
-                                                    "timestamp": {"type": "string", "format": "date-time"}
-                                                }
-                                            }
+                "tags": ["Customer", "Balance"],
+                "security": _BEARER_SECURITY
+            }
+        },
+        "/transactions": {
+            "get": {
+                "operationId": "getTransactions",
+                "summary": "Get transaction history",
+                "description": "Retrieves transaction history with optional filtering",
+                "parameters": [
+                    {
+                        "name": "customerId",
+                        "in": "query",
+                        "schema": {"type": "string"},
+                        "description": "Filter by customer ID"
+                    },
+                    {
+                        "name": "startDate",
+                        "in": "query",
+                        "schema": {"type": "string", "format": "date"},
+                        "description": "Start date for transaction range"
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "Successful response",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "id": {"type": "string"},
+                                            "amount": {"type": "number"},
+                                            "description": {"type": "string"},
+                                            "timestamp": _DATE_TIME_SCHEMA
                                         }
                                     }
                                 }
                             }
-                        },
-                        "tags": ["Transactions"],
-                        "security": [{"bearerAuth": []}]
-                    }
-                }
-            },
-            "components": {
-                "securitySchemes": {
-                    "bearerAuth": {
-                        "type": "http",
-                        "scheme": "bearer",
-                        "bearerFormat": "JWT"
+                        }
                     }
-                }
-            },
-            "tags": [
-                {"name": "Customer", "description": "Customer management operations"},
-                {"name": "Balance", "description": "Account balance operations"},
-                {"name": "Transactions", "description": "Transaction history operations"}
-            ]
+                },
+                "tags": ["Transactions"],
+                "security": _BEARER_SECURITY
+            }
         }
-        
-        # Save OpenAPI spec
-        openapi_file = self.sample_data_dir / "customer_banking_api.yaml"
-        import yaml
-        with open(openapi_file, 'w') as f:
-            yaml.dump(openapi_spec, f, default_flow_style=False, sort_keys=False)
-        
-        print(f"   ✅ OpenAPI spec saved to: {openapi_file}")
-    
-    async def _create_sample_graphql(self):
-        """Create sample GraphQL schema"""
-        print("🔗 Creating sample GraphQL schema...")
-        
-        graphql_schema = """
+    },
+    "components": {
+        "securitySchemes": {
+            "bearerAuth": {
+                "type": "http",
+                "scheme": "bearer",
+                "bearerFormat": "JWT"
+            }
+        }
+    },
+    "tags": [
+        {"name": "Customer", "description": "Customer management operations"},
+        {"name": "Balance", "description": "Account balance operations"},
+        {"name": "Transactions", "description": "Transaction history operations"}
+    ]
+}
+
+_GRAPHQL_SCHEMA = """
         # Customer Banking GraphQL Schema
         
         type Customer {
@@ -272,19 +259,8 @@ class SampleDataCollector:
           description: String!
         }
         """
-        
-        # Save GraphQL schema
-        graphql_file = self.sample_data_dir / "customer_banking_schema.graphql"
-        with open(graphql_file, 'w') as f:
-            f.write(graphql_schema)
-        
-        print(f"   ✅ GraphQL schema saved to: {graphql_file}")
-    
-    async def _create_sample_soap(self):
-        """Create sample SOAP/WSDL specification"""
-        print("🧼 Creating sample SOAP/WSDL specification...")
-        
-        wsdl_content = """<?xml version="1.0" encoding="UTF-8"?>
+
+_WSDL_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
 <wsdl:definitions name="CustomerService"
                   targetNamespace="http://bank.com/customer"
                   xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
@@ -369,19 +345,8 @@ class SampleDataCollector:
         </wsdl:port>
     </wsdl:service>
 </wsdl:definitions>"""
-        
-        # Save WSDL file
-        wsdl_file = self.sample_data_dir / "customer_service.wsdl"
-        with open(wsdl_file, 'w') as f:
-            f.write(wsdl_content)
-        
-        print(f"   ✅ WSDL file saved to: {wsdl_file}")
-    
-    async def _create_sample_markdown(self):
-        """Create sample markdown documentation"""
-        print("📄 Creating sample markdown documentation...")
-        
-        markdown_content = """# Customer Identity API Documentation
+
+_MARKDOWN_CONTENT = """# Customer Identity API Documentation
 
 ## Overview
 The Customer Identity API provides endpoints for managing customer identity verification, authentication, and profile management.
@@ -467,298 +432,531 @@ For technical support, contact:
 - Documentation: https://docs.bank.com/api
 - Status page: https://status.bank.com
 """
+
+_POSTMAN_COLLECTION = {
+    "info": {
+        "name": "Customer Banking API",
+        "description": "Postman collection for Customer Banking API endpoints",
+        "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+    },
+    "variable": [
+        {
+            "key": "baseUrl",
+            "value": "https://api.bank.com/v1",
+            "type": "string"
+        },
+        {
+            "key": "customerId",
+            "value": "cust_12345",
+            "type": "string"
+        }
+    ],
+    "item": [
+        {
+            "name": "Get Customer Balance",
+            "request": {
+                "method": "GET",
+                "header": [
+                    {
+                        "key": "Authorization",
+                        "value": "Bearer {{token}}",
+                        "type": "text"
+                    }
+                ],
+                "url": {
+                    "raw": "{{baseUrl}}/customers/{{customerId}}/balance",
+                    "host": ["{{baseUrl}}"],
+                    "path": ["customers", "{{customerId}}", "balance"]
+                }
+            }
+        },
+        {
+            "name": "Get Transactions",
+            "request": {
+                "method": "GET",
+                "header": [
+                    {
+                        "key": "Authorization",
+                        "value": "Bearer {{token}}",
+                        "type": "text"
+                    }
+                ],
+                "url": {
+                    "raw": "{{baseUrl}}/transactions?customerId={{customerId}}",
+                    "host": ["{{baseUrl}}"],
+                    "path": ["transactions"],
+                    "query": [
+                        {
+                            "key": "customerId",
+                            "value": "{{customerId}}"
+                        }
+                    ]
+                }
+            }
+        }
+    ]
+}
+
+_HAR_CONTENT = {
+    "log": {
+        "version": "1.2",
+        "creator": {
+            "name": "CatalystAI Sample Generator",
+            "version": "1.0.0"
+        },
+        "entries": [
+            {
+                "startedDateTime": "2024-01-15T10:30:00.000Z",
+                "time": 150,
+                "request": {
+                    "method": "GET",
+                    "url": "https://api.bank.com/v1/customers/cust_12345/balance",
+                    "httpVersion": "HTTP/1.1",
+                    "headers": [
+                        {
+                            "name": "Authorization",
+                            "value": "Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
+                        },
+                        {
+                            "name": "User-Agent",
+                            "value": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+                        }
+                    ],
+                    "queryString": [],
+                    "cookies": [],
+                    "headersSize": 450,
+                    "bodySize": 0
+                },
+                "response": {
+                    "status": 200,
+                    "statusText": "OK",
+                    "httpVersion": "HTTP/1.1",
+                    "headers": [
+                        {
+                            "name": "Content-Type",
+                            "value": "application/json"
+                        }
+                    ],
+                    "cookies": [],
+                    "content": {
+                        "size": 89,
+                        "mimeType": "application/json",
+                        "text": "{\"balance\": 1250.75, \"currency\": \"USD\", \"lastUpdated\": \"2024-01-15T10:30:00Z\"}"
+                    },
+                    "redirectURL": "",
+                    "headersSize": 200,
+                    "bodySize": 89
+                },
+                "cache": {},
+                "timings": {
+                    "dns": 5,
+                    "connect": 15,
+                    "send": 2,
+                    "wait": 120,
+                    "receive": 8
+                }
+            },
+            {
+                "startedDateTime": "2024-01-15T10:31:00.000Z",
+                "time": 200,
+                "request": {
+                    "method": "GET",
+                    "url": "https://api.bank.com/v1/transactions?customerId=cust_12345",
+                    "httpVersion": "HTTP/1.1",
+                    "headers": [
+                        {
+                            "name": "Authorization",
+                            "value": "Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
+                        }
+                    ],
+                    "queryString": [
+                        {
+                            "name": "customerId",
+                            "value": "cust_12345"
+                        }
+                    ],
+                    "cookies": [],
+                    "headersSize": 450,
+                    "bodySize": 0
+                },
+                "response": {
+                    "status": 200,
+                    "statusText": "OK",
+                    "httpVersion": "HTTP/1.1",
+                    "headers": [
+                        {
+                            "name": "Content-Type",
+                            "value": "application/json"
+                        }
+                    ],
+                    "cookies": [],
+                    "content": {
+                        "size": 245,
+                        "mimeType": "application/json",
+                        "text": "[{\"id\": \"txn_001\", \"amount\": 100.00, \"description\": \"ATM Withdrawal\", \"timestamp\": \"2024-01-15T09:00:00Z\"}]"
+                    },
+                    "redirectURL": "",
+                    "headersSize": 200,
+                    "bodySize": 245
+                },
+                "cache": {},
+                "timings": {
+                    "dns": 3,
+                    "connect": 12,
+                    "send": 1,
+                    "wait": 175,
+                    "receive": 9
+                }
+            }
+        ]
+    }
+}
+
+# The JSON samples are serialized once; writing them is a single write()
+_POSTMAN_BYTES = _dump_json(_POSTMAN_COLLECTION)
+_HAR_BYTES = _dump_json(_HAR_CONTENT)
+
+# The text samples are encoded once too, so they are written in binary mode
+_GRAPHQL_BYTES = _GRAPHQL_SCHEMA.encode("utf-8")
+_WSDL_BYTES = _WSDL_CONTENT.encode("utf-8")
+_MARKDOWN_BYTES = _MARKDOWN_CONTENT.encode("utf-8")
+
+# Sample files written by collect_sample_data, with the type they are processed as
+_SAMPLE_FILES = (
+    ("customer_banking_api.yaml", DocumentType.OPENAPI),
+    ("customer_banking_schema.graphql", DocumentType.GRAPHQL),
+    ("customer_service.wsdl", DocumentType.WSDL),
+    ("customer_identity_api.md", DocumentType.MARKDOWN),
+    ("customer_banking_api.postman_collection.json", DocumentType.POSTMAN),
+    ("customer_banking_api.har", DocumentType.HAR)
+)
+
+# Chunk size and overlap per document type: specs have hard syntactic
+# boundaries and chunk well large with no overlap, prose keeps more overlap
+_CHUNK_PARAMS = {
+    DocumentType.OPENAPI: (1024, 0),
+    DocumentType.WSDL: (1024, 0),
+    DocumentType.GRAPHQL: (1024, 0),
+    DocumentType.MARKDOWN: (512, 128),
+    DocumentType.POSTMAN: (2048, 0),
+    DocumentType.HAR: (2048, 0)
+}
+
+# Metadata shared by every sample file; each file copies it and sets its own
+# title, description, type and source, which skips re-validating the rest
+_BASE_META = DocumentMetadata(
+    title="",
+    description="",
+    document_type=DocumentType.OPENAPI,
+    source_url="",
+    system_name="Sample Banking System",
+    service_name="Customer Banking Service",
+    api_name="Customer Banking API",
+    tags=["sample", "banking", "customer"],
+    environment=Environment.DEV,
+    owners=["developer@bank.com"],
+    criticality="low",
+    domain="banking"
+)
+
+# Files larger than this are chunked while streaming instead of being read whole
+_STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+# Signature of the sample payloads, stamped next to the files so unchanged
+# samples are not regenerated
+_SAMPLE_SIGNATURE_FILE = ".sig"
+_SAMPLE_SIGNATURE = hashlib.blake2b(
+    b"\0".join((
+        _dump_json(_OPENAPI_SPEC),
+        _GRAPHQL_BYTES,
+        _WSDL_BYTES,
+        _MARKDOWN_BYTES,
+        _POSTMAN_BYTES,
+        _HAR_BYTES
+    )),
+    digest_size=8
+).hexdigest()
+
+class SampleDataCollector:
+    """Collects and processes sample API data for testing"""
+    
+    def __init__(self):
+        self.chunking_service = ChunkingService()
+        
+        # Chunking is pure-Python CPU work, so it runs in worker processes
+        self._pool = ProcessPoolExecutor(max_workers=min(len(_SAMPLE_FILES), os.cpu_count() or 1))
+        
+        # Sample data directory
+        self.sample_data_dir = Path(__file__).parent / "sample_data"
+        self.sample_data_dir.mkdir(exist_ok=True)
+    
+    @functools.cached_property
+    def document_service(self) -> DocumentService:
+        """Document service, created on first use"""
+        return DocumentService()
+    
+    @functools.cached_property
+    def embedding_service(self) -> EmbeddingService:
+        """Embedding service, created on first use since it may load a model"""
+        return EmbeddingService()
+    
+    async def collect_sample_data(self):
+        """Collect and process sample API data"""
+        log.info("🚀 Starting sample data collection for CatalystAI...")
+        
+        if await self._sample_data_is_current():
+            log.info(f"✅ Sample data is up to date in: {self.sample_data_dir}")
+            return
+        
+        try:
+            # The sample files are independent, so create them concurrently:
+            # OpenAPI, GraphQL, SOAP/WSDL, markdown, Postman and HAR
+            await asyncio.gather(
+                self._create_sample_openapi(),
+                self._create_sample_graphql(),
+                self._create_sample_soap(),
+                self._create_sample_markdown(),
+                self._create_sample_postman(),
+                self._create_sample_har()
+            )
+            
+            async with aiofiles.open(self.sample_data_dir / _SAMPLE_SIGNATURE_FILE, 'w') as f:
+                await f.write(_SAMPLE_SIGNATURE)
+            
+            log.info("✅ Sample data collection completed successfully!")
+            log.info(f"📁 Sample data saved to: {self.sample_data_dir}")
+            
+        except Exception as e:
+            log.error(f"❌ Error during data collection: {str(e)}")
+            raise
+    
+    async def _sample_data_is_current(self) -> bool:
+        """Check whether every sample file exists and was written from the current payloads"""
+        signature_file = self.sample_data_dir / _SAMPLE_SIGNATURE_FILE
+        if not await aiofiles.os.path.exists(signature_file):
+            return False
+        
+        async with aiofiles.open(signature_file, 'r') as f:
+            if (await f.read()).strip() != _SAMPLE_SIGNATURE:
+                return False
+        
+        for filename, _ in _SAMPLE_FILES:
+            if not await aiofiles.os.path.exists(self.sample_data_dir / filename):
+                return False
+        
+        return True
+    
+    async def _create_sample_openapi(self):
+        """Create sample OpenAPI specification"""
+        log.info("📝 Creating sample OpenAPI specification...")
+        
+        # Save OpenAPI spec
+        openapi_file = self.sample_data_dir / "customer_banking_api.yaml"
+        openapi_yaml = yaml.dump(_OPENAPI_SPEC, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
+        await asyncio.to_thread(openapi_file.write_bytes, openapi_yaml.encode("utf-8"))
+        
+        log.info(f"   ✅ OpenAPI spec saved to: {openapi_file}")
+    
+    async def _create_sample_graphql(self):
+        """Create sample GraphQL schema"""
+        log.info("🔗 Creating sample GraphQL schema...")
+        
+        # Save GraphQL schema
+        graphql_file = self.sample_data_dir / "customer_banking_schema.graphql"
+        await asyncio.to_thread(graphql_file.write_bytes, _GRAPHQL_BYTES)
+        
+        log.info(f"   ✅ GraphQL schema saved to: {graphql_file}")
+    
+    async def _create_sample_soap(self):
+        """Create sample SOAP/WSDL specification"""
+        log.info("🧼 Creating sample SOAP/WSDL specification...")
+        
+        # Save WSDL file
+        wsdl_file = self.sample_data_dir / "customer_service.wsdl"
+        await asyncio.to_thread(wsdl_file.write_bytes, _WSDL_BYTES)
+        
+        log.info(f"   ✅ WSDL file saved to: {wsdl_file}")
+    
+    async def _create_sample_markdown(self):
+        """Create sample markdown documentation"""
+        log.info("📄 Creating sample markdown documentation...")
         
         # Save markdown file
         markdown_file = self.sample_data_dir / "customer_identity_api.md"
-        with open(markdown_file, 'w') as f:
-            f.write(markdown_content)
+        await asyncio.to_thread(markdown_file.write_bytes, _MARKDOWN_BYTES)
         
-        print(f"   ✅ Markdown documentation saved to: {markdown_file}")
+        log.info(f"   ✅ Markdown documentation saved to: {markdown_file}")
     
     async def _create_sample_postman(self):
         """Create sample Postman collection"""
-        print("📮 Creating sample Postman collection...")
-        
-        postman_collection = {
-            "info": {
-                "name": "Customer Banking API",
-                "description": "Postman collection for Customer Banking API endpoints",
-                "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
-            },
-            "variable": [
-                {
-                    "key": "baseUrl",
-                    "value": "https://api.bank.com/v1",
-                    "type": "string"
-                },
-                {
-                    "key": "customerId",
-                    "value": "cust_12345",
-                    "type": "string"
-                }
-            ],
-            "item": [
-                {
-                    "name": "Get Customer Balance",
-                    "request": {
-                        "method": "GET",
-                        "header": [
-                            {
-                                "key": "Authorization",
-                                "value": "Bearer {{token}}",
-                                "type": "text"
-                            }
-                        ],
-                        "url": {
-                            "raw": "{{baseUrl}}/customers/{{customerId}}/balance",
-                            "host": ["{{baseUrl}}"],
-                            "path": ["customers", "{{customerId}}", "balance"]
-                        }
-                    }
-                },
-                {
-                    "name": "Get Transactions",
-                    "request": {
-                        "method": "GET",
-                        "header": [
-                            {
-                                "key": "Authorization",
-                                "value": "Bearer {{token}}",
-                                "type": "text"
-                            }
-                        ],
-                        "url": {
-                            "raw": "{{baseUrl}}/transactions?customerId={{customerId}}",
-                            "host": ["{{baseUrl}}"],
-                            "path": ["transactions"],
-                            "query": [
-                                {
-                                    "key": "customerId",
-                                    "value": "{{customerId}}"
-                                }
-                            ]
-                        }
-                    }
-                }
-            ]
-        }
+        log.info("📮 Creating sample Postman collection...")
         
         # Save Postman collection
         postman_file = self.sample_data_dir / "customer_banking_api.postman_collection.json"
-        with open(postman_file, 'w') as f:
-            json.dump(postman_collection, f, indent=2)
+        await asyncio.to_thread(postman_file.write_bytes, _POSTMAN_BYTES)
         
-        print(f"   ✅ Postman collection saved to: {postman_file}")
+        log.info(f"   ✅ Postman collection saved to: {postman_file}")
     
     async def _create_sample_har(self):
         """Create sample HAR file"""
-        print("📊 Creating sample HAR file...")
-        
-        har_content = {
-            "log": {
-                "version": "1.2",
-                "creator": {
-                    "name": "CatalystAI Sample Generator",
-                    "version": "1.0.0"
-                },
-                "entries": [
-                    {
-                        "startedDateTime": "2024-01-15T10:30:00.000Z",
-                        "time": 150,
-                        "request": {
-                            "method": "GET",
-                            "url": "https://api.bank.com/v1/customers/cust_12345/balance",
-                            "httpVersion": "HTTP/1.1",
-                            "headers": [
-                                {
-                                    "name": "Authorization",
-                                    "value": "Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
-                                },
-                                {
-                                    "name": "User-Agent",
-                                    "value": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                                }
-                            ],
-                            "queryString": [],
-                            "cookies": [],
-                            "headersSize": 450,
-                            "bodySize": 0
-                        },
-                        "response": {
-                            "status": 200,
-                            "statusText": "OK",
-                            "httpVersion": "HTTP/1.1",
-                            "headers": [
-                                {
-                                    "name": "Content-Type",
-                                    "value": "application/json"
-                                }
-                            ],
-                            "cookies": [],
-                            "content": {
-                                "size": 89,
-                                "mimeType": "application/json",
-                                "text": "{\"balance\": 1250.75, \"currency\": \"USD\", \"lastUpdated\": \"2024-01-15T10:30:00Z\"}"
-                            },
-                            "redirectURL": "",
-                            "headersSize": 200,
-                            "bodySize": 89
-                        },
-                        "cache": {},
-                        "timings": {
-                            "dns": 5,
-                            "connect": 15,
-                            "send": 2,
-                            "wait": 120,
-                            "receive": 8
-                        }
-                    },
-                    {
-                        "startedDateTime": "2024-01-15T10:31:00.000Z",
-                        "time": 200,
-                        "request": {
-                            "method": "GET",
-                            "url": "https://api.bank.com/v1/transactions?customerId=cust_12345",
-                            "httpVersion": "HTTP/1.1",
-                            "headers": [
-                                {
-                                    "name": "Authorization",
-                                    "value": "Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
-                                }
-                            ],
-                            "queryString": [
-                                {
-                                    "name": "customerId",
-                                    "value": "cust_12345"
-                                }
-                            ],
-                            "cookies": [],
-                            "headersSize": 450,
-                            "bodySize": 0
-                        },
-                        "response": {
-                            "status": 200,
-                            "statusText": "OK",
-                            "httpVersion": "HTTP/1.1",
-                            "headers": [
-                                {
-                                    "name": "Content-Type",
-                                    "value": "application/json"
-                                }
-                            ],
-                            "cookies": [],
-                            "content": {
-                                "size": 245,
-                                "mimeType": "application/json",
-                                "text": "[{\"id\": \"txn_001\", \"amount\": 100.00, \"description\": \"ATM Withdrawal\", \"timestamp\": \"2024-01-15T09:00:00Z\"}]"
-                            },
-                            "redirectURL": "",
-                            "headersSize": 200,
-                            "bodySize": 245
-                        },
-                        "cache": {},
-                        "timings": {
-                            "dns": 3,
-                            "connect": 12,
-                            "send": 1,
-                            "wait": 175,
-                            "receive": 9
-                        }
-                    }
-                ]
-            }
-        }
+        log.info("📊 Creating sample HAR file...")
         
         # Save HAR file
         har_file = self.sample_data_dir / "customer_banking_api.har"
-        with open(har_file, 'w') as f:
-            json.dump(har_content, f, indent=2)
+        await asyncio.to_thread(har_file.write_bytes, _HAR_BYTES)
         
-        print(f"   ✅ HAR file saved to: {har_file}")
+        log.info(f"   ✅ HAR file saved to: {har_file}")
     
-    async def process_sample_data(self):
-        """Process the collected sample data to demonstrate the RAG service"""
-        print("\n🔄 Processing sample data with RAG service...")
+    async def process_sample_data(self, embed: bool = False):
+        """Process the collected sample data to demonstrate the RAG service
+        
+        Chunks are only embedded when embed is set.
+        """
+        log.info("\n🔄 Processing sample data with RAG service...")
         
         try:
-            # Process each sample file
-            sample_files = [
-                ("customer_banking_api.yaml", DocumentType.OPENAPI),
-                ("customer_banking_schema.graphql", DocumentType.GRAPHQL),
-                ("customer_service.wsdl", DocumentType.WSDL),
-                ("customer_identity_api.md", DocumentType.MARKDOWN),
-                ("customer_banking_api.postman_collection.json", DocumentType.POSTMAN),
-                ("customer_banking_api.har", DocumentType.HAR)
-            ]
+            # Process the sample files concurrently, at most four at a time
+            semaphore = asyncio.Semaphore(4)
             
-            for filename, doc_type in sample_files:
+            async def process_one(filename: str, doc_type: DocumentType) -> List[Dict[str, Any]]:
                 file_path = self.sample_data_dir / filename
-                if file_path.exists():
-                    await self._process_sample_file(file_path, doc_type)
+                if not await aiofiles.os.path.exists(file_path):
+                    return []
+                async with semaphore:
+                    return await self._process_sample_file(file_path, doc_type)
+            
+            chunks_per_file = await asyncio.gather(
+                *(process_one(filename, doc_type) for filename, doc_type in _SAMPLE_FILES)
+            )
+            all_chunks = [chunk for chunks in chunks_per_file for chunk in chunks]
             
-            print("✅ Sample data processing completed!")
+            # Embed the chunks of every file together, one model call per batch
+            if embed and all_chunks:
+                await self._embed_chunks(all_chunks)
+            
+            log.info("✅ Sample data processing completed!")
             
         except Exception as e:
-            print(f"❌ Error during data processing: {str(e)}")
+            log.error(f"❌ Error during data processing: {str(e)}")
             raise
     
-    async def _process_sample_file(self, file_path: Path, doc_type: DocumentType):
-        """Process a single sample file"""
-        print(f"   📝 Processing {file_path.name}...")
+    async def _process_sample_file(self, file_path: Path, doc_type: DocumentType) -> List[Dict[str, Any]]:
+        """Process a single sample file and return its chunks"""
+        log.info(f"   📝 Processing {file_path.name}...")
         
         try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Create metadata
-            metadata = DocumentMetadata(
-                title=f"Sample {doc_type.value.title()} - {file_path.stem}",
-                description=f"Sample {doc_type.value} file for testing",
-                document_type=doc_type,
-                source_url=str(file_path),
-                system_name="Sample Banking System",
-                service_name="Customer Banking Service",
-                api_name="Customer Banking API",
-                tags=["sample", "banking", "customer"],
-                environment=Environment.DEV,
-                owners=["developer@bank.com"],
-                criticality="low",
-                domain="banking"
-            )
+            metadata = _BASE_META.model_copy(update={
+                "title": f"Sample {doc_type.value.title()} - {file_path.stem}",
+                "description": f"Sample {doc_type.value} file for testing",
+                "document_type": doc_type,
+                "source_url": str(file_path),
+                # model_copy is shallow; give each document its own lists
+                "tags": list(_BASE_META.tags),
+                "owners": list(_BASE_META.owners)
+            })
+            chunk_size, chunk_overlap = _CHUNK_PARAMS[doc_type]
             
-            # Create chunks
-            chunks = self.chunking_service.create_chunks(
-                content=content,
-                metadata=metadata,
-                chunk_size=512,
-                chunk_overlap=50
-            )
+            if await aiofiles.os.path.getsize(file_path) > _STREAM_THRESHOLD_BYTES:
+                # Large files are streamed through the sliding window chunker,
+                # so only the current window is held in memory. Note this differs
+                # from the recursive strategy used below: chunk boundaries follow
+                # fixed windows rather than paragraphs, and chunk metadata has
+                # strategy "sliding_window" and total_chunks -1
+                async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+                    chunks = [
+                        chunk async for chunk in self.chunking_service.create_chunks_iter(
+                            f, metadata, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+                        )
+                    ]
+            else:
+                # Read file content
+                async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+                    content = await f.read()
+                
+                # Create chunks in the process pool so files chunk in parallel across cores
+                chunks = await asyncio.get_running_loop().run_in_executor(
+                    self._pool,
+                    _chunk_worker,
+                    content,
+                    metadata,
+                    chunk_size,
+                    chunk_overlap
+                )
             
-            print(f"      ✅ Created {len(chunks)} chunks")
+            log.info(f"      ✅ Created {len(chunks)} chunks")
             
             # Validate chunks
             validation = self.chunking_service.validate_chunks(chunks)
             if validation["valid"]:
-                print(f"      ✅ Chunks validated successfully")
+                log.info(f"      ✅ Chunks validated successfully")
             else:
-                print(f"      ⚠️  Chunk validation warnings: {validation['warnings']}")
+                log.warning(f"      ⚠️  Chunk validation warnings: {validation['warnings']}")
+            
+            return chunks
             
         except Exception as e:
-            print(f"      ❌ Error processing {file_path.name}: {str(e)}")
-
-async def main():
-    """Main function"""
-    collector = SampleDataCollector()
+            log.exception(f"      ❌ Error processing {file_path.name}: {str(e)}")
+            return []
+    
+    async def __aenter__(self) -> "SampleDataCollector":
+        return self
     
-    # Collect sample data
-    await collector.collect_sample_data()
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
     
-    # Process sample data
-    await collector.process_sample_data()
+    async def aclose(self):
+        """Shut down the chunking process pool and the embedding service, if it was created"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        
+        # Only close the embedding service when it was used, rather than creating it here
+        embedding_service = self.__dict__.get("embedding_service")
+        if embedding_service is not None and hasattr(embedding_service, "aclose"):
+            await embedding_service.aclose()
+    
+    async def _embed_chunks(self, chunks: List[Dict[str, Any]], batch_size: int = settings.EMBEDDING_BATCH_SIZE):
+        """Generate embeddings for chunks in batches and attach them to each chunk"""
+        log.info(f"   🧮 Embedding {len(chunks)} chunks in batches of {batch_size}...")
+        
+        try:
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start:start + batch_size]
+                embeddings = await self.embedding_service.generate_embeddings(
+                    texts=[chunk["text"] for chunk in batch],
+                    model=settings.EMBEDDING_MODEL
+                )
+                for chunk, embedding in zip(batch, embeddings):
+                    chunk["embedding"] = embedding
+            
+            log.info(f"      ✅ Embedded {len(chunks)} chunks")
+            
+        except Exception as e:
+            log.exception(f"      ❌ Error embedding chunks: {str(e)}")
+
+async def main(embed: bool = False):
+    """Main function"""
+    async with SampleDataCollector() as collector:
+        # Collect sample data
+        await collector.collect_sample_data()
+        
+        # Process sample data
+        await collector.process_sample_data(embed=embed)
     
-    print("\n🎉 Sample data collection and processing completed!")
-    print("You can now use these sample files to test the CatalystAI RAG service.")
+    log.info("\n🎉 Sample data collection and processing completed!")
+    log.info("You can now use these sample files to test the CatalystAI RAG service.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Collect and process sample API data for CatalystAI")
+    parser.add_argument("--embed", action="store_true", help="Also generate embeddings for the sample chunks")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
+    # uvloop (installed with uvicorn[standard]) has cheaper task switching
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    asyncio.run(main(embed=args.embed))